@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark.py - Pomiar przepustowości (bity/s) funkcji FrameProcessor dla różnych rozmiarów i rodzajów wejścia.
+Wyniki są wypisywane jako tabela i opcjonalnie zapisywane do pliku JSON, aby porównywać kolejne wersje.
+
+Rodzaje wejścia:
+- ones   - same jedynki (najgorszy przypadek dla rozpychania bitów)
+- random - losowe bity
+- errors - losowe bity, a zakodowany strumień ma przekłamane bity z prawdopodobieństwem --error-rate
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from bitbuffer import BitBuffer, write_bits
+from flags import frame_spans
+from program import CRC_ENGINES, FrameProcessor
+
+INPUTS = ("ones", "random", "errors")
+FUNCTIONS = ("calculate_crc", "bit_stuff", "bit_unstuff", "create_frame", "extract_frame_data",
+             "encode_file", "decode_file")
+DEFAULT_SIZES = (10_000, 1_000_000, 10_000_000)
+
+
+def make_input(kind, size, rng):
+    """
+    Zwraca dane wejściowe (BitBuffer) o długości size bitów.
+    """
+    if kind == "ones":
+        return BitBuffer.from_int((1 << size) - 1, size)
+    return BitBuffer.from_int(rng.getrandbits(size), size)
+
+
+def inject_errors(bitstream, error_rate, rng):
+    """
+    Zwraca kopię strumienia z losowo przekłamanymi bitami (średnio error_rate * len(bitstream) błędów).
+    """
+    data = bytearray(bitstream.to_bytes())
+    errors = round(len(bitstream) * error_rate)
+    for position in rng.sample(range(len(bitstream)), min(errors, len(bitstream))):
+        data[position >> 3] ^= 0x80 >> (position & 7)
+    return BitBuffer.from_bytes(data, len(bitstream))
+
+
+def measure(func, repeat):
+    """
+    Zwraca najkrótszy czas wykonania func() z repeat prób.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_case(processor, kind, size, functions, repeat, error_rate, rng, workdir):
+    """
+    Mierzy wybrane funkcje dla jednego rodzaju i rozmiaru wejścia. Przepustowość jest liczona
+    względem liczby bitów danych wejściowych (size), niezależnie od narzutu ramek.
+    """
+    data = make_input(kind, size, rng)
+    chunks = list(processor.split_data([data]))
+    with_crc = [chunk + processor.calculate_crc(chunk) for chunk in chunks]
+    frames = [processor.create_frame(chunk) for chunk in chunks]
+    encoded = BitBuffer()
+    for frame in frames:
+        encoded += frame
+    if kind == "errors":
+        encoded = inject_errors(encoded, error_rate, rng)
+        frames = [encoded[start:end] for start, end in frame_spans(encoded, processor.FLAG)]
+    flag_len = len(processor.FLAG)
+    contents = [frame[flag_len:-flag_len] for frame in frames]
+
+    input_file = os.path.join(workdir, "input.txt")
+    encoded_file = os.path.join(workdir, "encoded.txt")
+    output_file = os.path.join(workdir, "output.txt")
+    if "encode_file" in functions:
+        write_bits(input_file, data)
+    if "decode_file" in functions:
+        write_bits(encoded_file, encoded)
+
+    cases = {
+        "calculate_crc": lambda: [processor.calculate_crc(chunk) for chunk in chunks],
+        "bit_stuff": lambda: [BitBuffer(processor.bit_stuff(bits.to_str())) for bits in with_crc],
+        "bit_unstuff": lambda: [BitBuffer(processor.bit_unstuff(content.to_str())) for content in contents],
+        "create_frame": lambda: [processor.create_frame(chunk) for chunk in chunks],
+        "extract_frame_data": lambda: [processor.extract_frame_data(frame) for frame in frames],
+        "encode_file": lambda: processor.encode_file(input_file, output_file),
+        "decode_file": lambda: processor.decode_file(encoded_file, output_file),
+    }
+
+    results = []
+    for name in functions:
+        # Komunikaty programu nie powinny wpływać na pomiar ani zaśmiecać wyniku
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            seconds = measure(cases[name], repeat)
+        results.append({
+            "input": kind,
+            "bits": size,
+            "function": name,
+            "seconds": seconds,
+            "bits_per_second": size / seconds if seconds > 0 else None,
+        })
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark przepustowości FrameProcessor.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="rozmiary wejścia w bitach (domyślnie: %(default)s)")
+    parser.add_argument("--inputs", choices=INPUTS, nargs="+", default=list(INPUTS),
+                        help="rodzaje wejścia (domyślnie wszystkie)")
+    parser.add_argument("--functions", choices=FUNCTIONS, nargs="+", default=list(FUNCTIONS),
+                        help="mierzone funkcje (domyślnie wszystkie)")
+    parser.add_argument("--repeat", type=int, default=3, help="liczba powtórzeń, liczy się najlepszy czas")
+    parser.add_argument("--error-rate", type=float, default=1e-4,
+                        help="prawdopodobieństwo przekłamania bitu dla wejścia 'errors' (domyślnie 1e-4)")
+    parser.add_argument("--crc-engine", choices=CRC_ENGINES, default="table", help="silnik CRC")
+    parser.add_argument("--seed", type=int, default=0, help="ziarno generatora danych")
+    parser.add_argument("--output", help="plik JSON z wynikami")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    processor = FrameProcessor(crc_engine=args.crc_engine)
+    rng = random.Random(args.seed)
+
+    results = []
+    print(f"{'wejście':<8} {'bity':>12} {'funkcja':<20} {'czas [s]':>10} {'Mbit/s':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            for kind in args.inputs:
+                for result in bench_case(processor, kind, size, args.functions, args.repeat,
+                                         args.error_rate, rng, workdir):
+                    results.append(result)
+                    rate = result["bits_per_second"]
+                    mbits = f"{rate / 1e6:10.3f}" if rate is not None else f"{'-':>10}"
+                    print(f"{kind:<8} {size:>12} {result['function']:<20} {result['seconds']:>10.4f} {mbits}")
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "crc_engine": args.crc_engine,
+                "frame_length": processor.FRAME_LENGTH,
+                "crc_poly": processor.CRC_POLY,
+                "repeat": args.repeat,
+                "error_rate": args.error_rate,
+                "seed": args.seed,
+            },
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wyniki zapisano do: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bitbuffer.py - Zwarty bufor bitów oparty na bytearray (8 bitów na bajt zamiast jednego znaku na bit).
+Zawiera także warstwę importu/eksportu do plików tekstowych '0'/'1' oraz binarnych.
+"""
+
+FORMATS = ("text", "bin")
+
+_BIN_MAGIC = b"BITS"
+_TEXT_CHUNK = 1 << 20  # liczba znaków/bitów przetwarzanych naraz przy imporcie i eksporcie
+_FIND_BLOCK = 512  # początkowy rozmiar bloku przy wyszukiwaniu wzorca
+_NOT_BITS = str.maketrans('', '', '01')
+
+
+def _pack(value, bit_length):
+    """
+    Pakuje liczbę o długości bit_length bitów do bajtów, wyrównując do lewej (najstarszy bit pierwszy).
+    """
+    pad = -bit_length % 8
+    return (value << pad).to_bytes((bit_length + pad) // 8, 'big')
+
+
+def _check_bits(text):
+    if text.translate(_NOT_BITS):
+        raise ValueError("Plik źródłowy musi zawierać tylko znaki '0' i '1'")
+
+
+class BitBuffer:
+    """
+    Ciąg bitów przechowywany w bytearray, najstarszy bit bajtu jest pierwszy.
+    Nieużyte bity ostatniego bajtu są zawsze zerami.
+    """
+    __slots__ = ("_data", "_length")
+
+    def __init__(self, bits=None):
+        self._data = bytearray()
+        self._length = 0
+        if bits is not None:
+            self.extend(bits)
+
+    @classmethod
+    def from_int(cls, value, bit_length):
+        buf = cls()
+        buf._data = bytearray(_pack(value, bit_length))
+        buf._length = bit_length
+        return buf
+
+    @classmethod
+    def from_bytes(cls, data, bit_length=None):
+        buf = cls()
+        buf._data = bytearray(data)
+        buf._length = len(data) * 8 if bit_length is None else bit_length
+        if buf._length > len(buf._data) * 8:
+            raise ValueError("Długość w bitach przekracza rozmiar danych")
+        del buf._data[(buf._length + 7) // 8:]
+        if buf._length % 8:
+            buf._data[-1] &= (0xFF << (8 - buf._length % 8)) & 0xFF
+        return buf
+
+    def __len__(self):
+        return self._length
+
+    def to_int(self):
+        return int.from_bytes(self._data, 'big') >> (-self._length % 8)
+
+    def to_bytes(self):
+        return bytes(self._data)
+
+    def to_str(self):
+        if not self._length:
+            return ""
+        return format(self.to_int(), f'0{self._length}b')
+
+    def __str__(self):
+        return self.to_str()
+
+    def __repr__(self):
+        if self._length > 64:
+            return f"BitBuffer('{self[:64].to_str()}...', len={self._length})"
+        return f"BitBuffer('{self.to_str()}')"
+
+    def __eq__(self, other):
+        if isinstance(other, BitBuffer):
+            return self._length == other._length and self._data == other._data
+        if isinstance(other, str):
+            return self._length == len(other) and self.to_str() == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self._length, bytes(self._data)))
+
+    def append(self, bit):
+        """
+        Dopisuje pojedynczy bit (0/1 lub '0'/'1').
+        """
+        offset = self._length % 8
+        if offset == 0:
+            self._data.append(0)
+        if bit == 1 or bit == '1':
+            self._data[-1] |= 0x80 >> offset
+        elif bit != 0 and bit != '0':
+            raise ValueError(f"Nieprawidłowy bit: {bit!r}")
+        self._length += 1
+
+    def extend(self, bits):
+        """
+        Dopisuje ciąg bitów (BitBuffer lub string '0'/'1').
+        """
+        if isinstance(bits, BitBuffer):
+            if self._length % 8 == 0:
+                self._data += bits._data
+                self._length += bits._length
+                return
+            value, length = bits.to_int(), bits._length
+        else:
+            bits = str(bits)
+            _check_bits(bits)
+            value, length = (int(bits, 2) if bits else 0), len(bits)
+        if not length:
+            return
+
+        offset = self._length % 8
+        if offset:
+            # Łączymy niepełny ostatni bajt z dopisywanymi bitami
+            head = self._data.pop() >> (8 - offset)
+            value |= head << length
+            length += offset
+        self._data += _pack(value, length)
+        self._length += length - offset
+
+    def __iadd__(self, bits):
+        self.extend(bits)
+        return self
+
+    def __add__(self, other):
+        if not isinstance(other, (BitBuffer, str)):
+            return NotImplemented
+        result = self.copy()
+        result.extend(other)
+        return result
+
+    def __radd__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        result = BitBuffer(other)
+        result.extend(self)
+        return result
+
+    def copy(self):
+        buf = BitBuffer()
+        buf._data = bytearray(self._data)
+        buf._length = self._length
+        return buf
+
+    def _bits_value(self, start, stop):
+        """
+        Zwraca bity z przedziału [start, stop) jako liczbę całkowitą.
+        """
+        if stop <= start:
+            return 0
+        first_byte = start // 8
+        last_byte = (stop + 7) // 8
+        value = int.from_bytes(self._data[first_byte:last_byte], 'big')
+        value >>= last_byte * 8 - stop
+        return value & ((1 << (stop - start)) - 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                raise ValueError("BitBuffer obsługuje tylko wycinki z krokiem 1")
+            stop = max(start, stop)
+            if start % 8 == 0:
+                return BitBuffer.from_bytes(self._data[start // 8:(stop + 7) // 8], stop - start)
+            return BitBuffer.from_int(self._bits_value(start, stop), stop - start)
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Indeks bitu poza zakresem")
+        return (self._data[index >> 3] >> (7 - (index & 7))) & 1
+
+    def __iter__(self):
+        for start in range(0, self._length, _TEXT_CHUNK):
+            yield from map(int, self[start:start + _TEXT_CHUNK].to_str())
+
+    def iter_text(self, chunk_bits=_TEXT_CHUNK):
+        """
+        Zwraca kolejne fragmenty bufora jako stringi '0'/'1' (eksport bez budowania całego napisu).
+        """
+        for start in range(0, self._length, chunk_bits):
+            yield self[start:start + chunk_bits].to_str()
+
+    def find(self, pattern, start=0, end=None):
+        """
+        Wyszukuje wzorzec (string '0'/'1' lub BitBuffer) w przedziale [start, end).
+        Zwraca pozycję pierwszego wystąpienia lub -1.
+        Przeszukiwanie odbywa się coraz większymi blokami (od _FIND_BLOCK do _TEXT_CHUNK bitów),
+        więc bliskie wystąpienia są tanie, a cały bufor nigdy nie jest zamieniany na tekst.
+        """
+        pattern = str(pattern)
+        start, end, _ = slice(start, end).indices(self._length)
+        overlap = max(len(pattern) - 1, 0)
+        position = start
+        block = _FIND_BLOCK
+        while position < end:
+            block_end = min(position + block + overlap, end)
+            found = self[position:block_end].to_str().find(pattern)
+            if found != -1:
+                return position + found
+            if block_end == end:
+                break
+            position += block
+            block = min(block * 2, _TEXT_CHUNK)
+        return -1 if pattern else start
+
+    def startswith(self, pattern):
+        pattern = str(pattern)
+        return len(pattern) <= self._length and self[:len(pattern)].to_str() == pattern
+
+    def endswith(self, pattern):
+        pattern = str(pattern)
+        return len(pattern) <= self._length and self[self._length - len(pattern):].to_str() == pattern
+
+
+def _check_format(fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f"Nieznany format pliku '{fmt}'. Dostępne: {', '.join(FORMATS)}")
+
+
+def iter_bits(path, fmt="text", chunk_bits=_TEXT_CHUNK, offset=0):
+    """
+    Czyta plik fragmentami po około chunk_bits bitów i zwraca kolejne BitBuffery.
+    Format "text" to ciąg znaków '0'/'1' (białe znaki na końcach pliku są pomijane),
+    format "bin" to nagłówek BITS, długość w bitach (8 bajtów) i spakowane bity.
+    Pierwsze offset bajtów pliku (np. nagłówek konfiguracji) jest pomijane.
+    """
+    _check_format(fmt)
+    if fmt == "bin":
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            if f.read(len(_BIN_MAGIC)) != _BIN_MAGIC:
+                raise ValueError("Plik nie jest w formacie binarnym BitBuffer")
+            remaining = int.from_bytes(f.read(8), 'big')
+            chunk_bytes = max(chunk_bits // 8, 1)
+            while remaining > 0:
+                data = f.read(chunk_bytes)
+                if not data:
+                    raise ValueError("Plik binarny jest krótszy niż zapisana długość")
+                bit_length = min(len(data) * 8, remaining)
+                remaining -= bit_length
+                yield BitBuffer.from_bytes(data, bit_length)
+        return
+
+    pending = ""  # białe znaki z końca poprzedniego fragmentu
+    started = False
+    with open(path, 'r', encoding='utf-8') as f:
+        f.seek(offset)
+        while True:
+            chunk = f.read(chunk_bits)
+            if not chunk:
+                break
+            if not started:
+                chunk = chunk.lstrip()
+                started = bool(chunk)
+            text = pending + chunk
+            stripped = text.rstrip()
+            pending = text[len(stripped):]
+            if stripped:
+                yield BitBuffer(stripped)
+
+
+def read_bits(path, fmt="text", offset=0):
+    """
+    Wczytuje cały plik do jednego BitBuffer (formaty jak w iter_bits).
+    """
+    buf = BitBuffer()
+    for chunk in iter_bits(path, fmt, offset=offset):
+        buf += chunk
+    return buf
+
+
+class BitWriter:
+    """
+    Zapisuje do pliku kolejne fragmenty strumienia bitów, bez trzymania całości w pamięci.
+    W formacie "bin" długość w nagłówku jest uzupełniana przy zamknięciu pliku.
+    Opcjonalny header (tekst ASCII) jest zapisywany na samym początku pliku, przed danymi.
+    """
+
+    def __init__(self, path, fmt="text", header=""):
+        _check_format(fmt)
+        self.fmt = fmt
+        self.length = 0
+        self._header_size = len(header.encode('ascii'))
+        self._tail = BitBuffer()  # bity, które nie wypełniły jeszcze pełnego bajtu
+        if fmt == "bin":
+            self._file = open(path, 'wb')
+            self._file.write(header.encode('ascii'))
+            self._file.write(_BIN_MAGIC)
+            self._file.write(bytes(8))
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+            self._file.write(header)
+
+    def write(self, bits):
+        self.length += len(bits)
+        if self.fmt == "text":
+            if isinstance(bits, BitBuffer):
+                for text in bits.iter_text():
+                    self._file.write(text)
+            else:
+                self._file.write(bits)
+            return
+
+        self._tail += bits
+        whole = len(self._tail) - len(self._tail) % 8
+        if whole:
+            self._file.write(self._tail[:whole].to_bytes())
+            self._tail = self._tail[whole:]
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.fmt == "bin":
+            self._file.write(self._tail.to_bytes())
+            self._file.seek(self._header_size + len(_BIN_MAGIC))
+            self._file.write(self.length.to_bytes(8, 'big'))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def write_bits(path, buf, fmt="text", header=""):
+    """
+    Zapisuje BitBuffer do pliku w formacie "text" (ciąg '0'/'1' bez nowych linii) lub "bin".
+    """
+    with BitWriter(path, fmt, header) as writer:
+        writer.write(buf)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+crc.py - Tablicowy (bajtowy) silnik CRC dla dowolnego wielomianu do CRC-32.
+Daje wyniki identyczne z dzieleniem modulo 2 bit po bicie z FrameProcessor.calculate_crc.
+"""
+
+MAX_CRC_WIDTH = 32
+
+# Nazwane wielomiany (najstarszy bit pierwszy), do wyboru zamiast podawania ciągu bitów
+CRC_POLYS = {
+    "crc8": "100000111",  # x^8 + x^2 + x + 1
+    "crc16": "10001000000100001",  # CRC-16-CCITT, x^16 + x^12 + x^5 + 1
+    "crc32": "100000100110000010001110110110111",  # CRC-32 (IEEE 802.3)
+}
+
+
+def resolve_poly(poly):
+    """
+    Zamienia nazwę wielomianu z CRC_POLYS na ciąg bitów; inne wartości zwraca bez zmian.
+    """
+    return CRC_POLYS.get(poly, poly)
+
+
+class CRCTable:
+    def __init__(self, poly):
+        """
+        Buduje 256-elementową tablicę reszt dla wielomianu podanego jako string bitów
+        (np. "100000111" dla x^8 + x^2 + x + 1). Najstarszy bit wielomianu musi być jedynką.
+        """
+        if not poly or not all(c in '01' for c in poly):
+            raise ValueError("Wielomian CRC musi być ciągiem znaków '0' i '1'")
+        if poly[0] != '1':
+            raise ValueError("Najstarszy bit wielomianu CRC musi być jedynką")
+        self.width = len(poly) - 1
+        if not 1 <= self.width <= MAX_CRC_WIDTH:
+            raise ValueError(f"Obsługiwane są wielomiany CRC o stopniu od 1 do {MAX_CRC_WIDTH}")
+
+        self.poly = poly
+        # Dla CRC węższych niż 8 bitów rejestr jest poszerzany do bajtu,
+        # a wielomian przesuwany w lewo (reszta jest cofana na końcu obliczeń)
+        self._register_width = max(self.width, 8)
+        self._shift = self._register_width - self.width
+        self._register_mask = (1 << self._register_width) - 1
+        self._top_shift = self._register_width - 8
+        generator = (int(poly, 2) & ((1 << self.width) - 1)) << self._shift
+        self.table = self._build_table(generator)
+
+    def _build_table(self, generator):
+        top_bit = 1 << (self._register_width - 1)
+        table = []
+        for byte in range(256):
+            register = byte << self._top_shift
+            for _ in range(8):
+                if register & top_bit:
+                    register = ((register << 1) ^ generator) & self._register_mask
+                else:
+                    register = (register << 1) & self._register_mask
+            table.append(register)
+        return table
+
+    def remainder(self, data):
+        """
+        Oblicza resztę CRC (jako liczbę całkowitą) dla ciągu bajtów, najstarszy bit pierwszy.
+        """
+        table = self.table
+        mask = self._register_mask
+        top_shift = self._top_shift
+        register = 0
+        for byte in data:
+            register = ((register << 8) & mask) ^ table[((register >> top_shift) ^ byte) & 0xFF]
+        return register >> self._shift
+
+    def remainder_bits(self, value, bit_length):
+        """
+        Oblicza resztę CRC dla liczby całkowitej traktowanej jako bit_length bitów.
+        Rejestr startuje od zera, więc zera dopisane z przodu do pełnego bajtu nie zmieniają wyniku.
+        """
+        return self.remainder(value.to_bytes((bit_length + 7) // 8, 'big'))
+
+    def calculate(self, data_bits):
+        """
+        Oblicza sumę kontrolną dla ciągu bitów (jako string '0'/'1').
+        Zwraca resztę jako string bitów o długości równej stopniowi wielomianu.
+        """
+        value = int(data_bits, 2) if data_bits else 0
+        return format(self.remainder_bits(value, len(data_bits)), f'0{self.width}b')
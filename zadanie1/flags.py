@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+flags.py - Jednoprzebiegowe wyszukiwanie flag i granic ramek w strumieniu bitów.
+Buduje indeks wszystkich wystąpień flagi (także nakładających się) i zamienia go na zakresy ramek.
+"""
+
+import re
+from array import array
+from collections import deque
+
+from bitbuffer import BitBuffer
+
+DEFAULT_FLAG = "01111110"
+_SCAN_BLOCK = 1 << 20  # liczba bitów zamienianych naraz na tekst podczas skanowania
+
+
+class FlagScanner:
+    """
+    Skaner flag działający na kolejnych fragmentach strumienia (string '0'/'1' lub BitBuffer).
+    Każdy bit jest przeglądany raz; ostatnie len(flag) - 1 bitów jest przenoszone między fragmentami,
+    więc flagi na granicy fragmentów nie są gubione. Pozycje są liczone od początku całego strumienia.
+    """
+
+    def __init__(self, flag=DEFAULT_FLAG):
+        if not flag or flag.translate(str.maketrans('', '', '01')):
+            raise ValueError("Flaga musi być niepustym ciągiem znaków '0' i '1'")
+        self.flag = flag
+        # Dopasowanie z wyprzedzeniem znajduje także wystąpienia nakładające się
+        self._pattern = re.compile(f"(?={flag})")
+        self._carry = ""
+        self._position = 0  # pozycja początku self._carry w całym strumieniu
+
+    def feed(self, chunk):
+        """
+        Przetwarza kolejny fragment strumienia i zwraca (generator) pozycje flag, które się w nim zakończyły.
+        """
+        if isinstance(chunk, BitBuffer):
+            blocks = chunk.iter_text(_SCAN_BLOCK)
+        else:
+            blocks = (chunk[i:i + _SCAN_BLOCK] for i in range(0, len(chunk), _SCAN_BLOCK))
+        keep = len(self.flag) - 1
+        for block in blocks:
+            text = self._carry + block
+            for match in self._pattern.finditer(text):
+                yield self._position + match.start()
+            carry_start = max(len(text) - keep, 0)
+            self._carry = text[carry_start:]
+            self._position += carry_start
+
+
+def find_flags(bitstream, flag=DEFAULT_FLAG):
+    """
+    Zwraca indeks (array 'q') pozycji wszystkich wystąpień flagi w strumieniu, w tym nakładających się.
+    """
+    return array('q', FlagScanner(flag).feed(bitstream))
+
+
+class FrameSpans:
+    """
+    Zamienia rosnący ciąg pozycji flag na zakresy ramek (start, end), gdzie bitstream[start:end]
+    to ramka razem z obiema flagami. Każda flaga jest traktowana jako możliwy początek ramki,
+    a ramka kończy się na pierwszej fladze nie nakładającej się na flagę otwierającą.
+    Puste ramki (dwie flagi obok siebie) są pomijane.
+    """
+
+    def __init__(self, flag_len):
+        self.flag_len = flag_len
+        self._pending = deque()  # pozycje flag, dla których nie znaleziono jeszcze końca ramki
+
+    @property
+    def first_pending(self):
+        """
+        Najwcześniejszy możliwy początek ramki, dla której nie znaleziono jeszcze flagi zamykającej (lub None).
+        """
+        return self._pending[0] if self._pending else None
+
+    def drop_first(self):
+        self._pending.popleft()
+
+    def add(self, offset):
+        """
+        Dodaje pozycję kolejnej flagi i zwraca listę zakresów ramek, które ta flaga zamknęła.
+        """
+        pending = self._pending
+        pending.append(offset)
+        spans = []
+        # Flaga offset zamyka wszystkie oczekujące ramki zaczynające się co najmniej flag_len bitów wcześniej
+        while pending[0] + self.flag_len <= offset:
+            start = pending.popleft()
+            end = next(p for p in pending if p >= start + self.flag_len)
+            if end - start > self.flag_len:
+                spans.append((start, end + self.flag_len))
+        return spans
+
+
+def iter_frame_spans(flag_offsets, flag_len):
+    """
+    Generator zakresów ramek dla rosnącego ciągu pozycji flag (patrz FrameSpans).
+    """
+    spans = FrameSpans(flag_len)
+    for offset in flag_offsets:
+        yield from spans.add(offset)
+
+
+def frame_spans(bitstream, flag=DEFAULT_FLAG):
+    """
+    Zwraca listę zakresów (start, end) wszystkich ramek w strumieniu (string '0'/'1' lub BitBuffer),
+    wyznaczonych w jednym przebiegu zgodnie z regułami FrameProcessor.decode_file.
+    """
+    return list(iter_frame_spans(FlagScanner(flag).feed(bitstream), len(flag)))
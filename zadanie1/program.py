@@ -5,20 +5,111 @@ program.py - Kodowanie i dekodowanie ramek z sumą kontrolną CRC, bit stuffingi
 Program realizuje ramkowanie, rozpychanie bitów, dodawanie i weryfikację CRC oraz obsługę plików wejściowych/wyjściowych.
 """
 
-import sys
+import argparse
+import contextlib
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from bitbuffer import FORMATS, BitBuffer, BitWriter, iter_bits, read_bits
+from crc import CRC_POLYS, CRCTable, resolve_poly
+from flags import FlagScanner, FrameSpans
+from stats import (STATUS_BAD_FLAGS, STATUS_CRC, STATUS_EMPTY, STATUS_OK, STATUS_TOO_LONG, STATUS_TOO_SHORT,
+                   DecodeStats)
+
+CRC_ENGINES = ("table", "bitwise")
+DEFAULT_FRAME_LENGTH = 150
+DEFAULT_CRC_POLY = CRC_POLYS["crc8"]
+DEFAULT_FLAG = "01111110"
+HEADER_TAG = "#FRAMECFG"  # początek linii nagłówka z konfiguracją w zakodowanym pliku
+NOT_BITS = str.maketrans('', '', '01')
+STREAM_CHUNK_BITS = 1 << 20  # rozmiar fragmentu czytanego w trybie strumieniowym
+MAX_FRAME_BITS = 1 << 20  # w trybie strumieniowym dłuższe ramki bez flagi zamykającej są odrzucane
+
+STUFF_PATTERN = re.compile("11111")  # po takim ciągu wstawiane jest zero
+UNSTUFF_PATTERN = re.compile("11111(0?)")  # zero po 5 jedynkach jest usuwane
+
+BATCH_FRAMES = 2048  # liczba ramek wysyłanych naraz do procesu roboczego
+
 
 class FrameProcessor:
-    def __init__(self):
+    def __init__(self, crc_engine="table", frame_length=DEFAULT_FRAME_LENGTH, crc_poly=DEFAULT_CRC_POLY,
+                 flag=DEFAULT_FLAG):
         # Ustawienia długości ramki i CRC
-        self.FRAME_LENGTH = 150  # liczba bitów danych w ramce
-        self.CRC_POLY = "100000111"  # wielomian CRC-8 (x^8 + x^2 + x + 1)
+        if frame_length <= 0:
+            raise ValueError("Długość ramki musi być dodatnia")
+        crc_poly = resolve_poly(crc_poly)
+        if not flag or flag.translate(NOT_BITS) or "111111" not in flag:
+            raise ValueError("Flaga musi być ciągiem '0'/'1' zawierającym sześć kolejnych jedynek, "
+                             "inaczej rozpychanie bitów nie chroni jej przed pojawieniem się w danych")
+        self.FRAME_LENGTH = frame_length  # liczba bitów danych w ramce
+        self.CRC_POLY = crc_poly  # wielomian CRC, domyślnie CRC-8 (x^8 + x^2 + x + 1)
         self.CRC_LENGTH = len(self.CRC_POLY) - 1
-        self.FLAG = "01111110"  # flaga początku/końca ramki
+        self.FLAG = flag  # flaga początku/końca ramki
+
+        # Silnik CRC: "table" - tablica 256 reszt (bajtowo), "bitwise" - dzielenie bit po bicie
+        if crc_engine not in CRC_ENGINES:
+            raise ValueError(f"Nieznany silnik CRC '{crc_engine}'. Dostępne: {', '.join(CRC_ENGINES)}")
+        self.crc_engine = crc_engine
+        crc_table = CRCTable(self.CRC_POLY)  # sprawdza też poprawność wielomianu
+        self.crc_table = crc_table if crc_engine == "table" else None
+
+        # Argumenty konstruktora, z którymi procesy robocze odtwarzają ten sam procesor
+        self.options = {"crc_engine": crc_engine, **self.config()}
+
+    def config(self):
+        """
+        Parametry ramkowania, które muszą być takie same przy kodowaniu i dekodowaniu.
+        """
+        return {"frame_length": self.FRAME_LENGTH, "crc_poly": self.CRC_POLY, "flag": self.FLAG}
+
+    def header(self):
+        """
+        Zwraca jednoliniowy nagłówek z konfiguracją, zapisywany na początku zakodowanego pliku.
+        """
+        fields = " ".join(f"{key}={value}" for key, value in self.config().items())
+        return f"{HEADER_TAG} {fields}\n"
+
+    def check_header(self, config):
+        """
+        Zgłasza ValueError, jeśli konfiguracja odczytana z nagłówka pliku różni się od ustawień procesora.
+        """
+        mismatched = [f"{key}={config[key]} (ustawiono {value})"
+                      for key, value in self.config().items() if key in config and config[key] != value]
+        if mismatched:
+            raise ValueError("Konfiguracja z nagłówka pliku nie zgadza się z ustawieniami dekodera: "
+                             + ", ".join(mismatched))
+
+    def executor(self, jobs):
+        """
+        Zwraca menedżer kontekstu z pulą procesów dla jobs > 1 (jobs=0 oznacza liczbę rdzeni)
+        albo kontekst zwracający None dla przetwarzania w bieżącym procesie.
+        """
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+        if jobs <= 1:
+            return contextlib.nullcontext()
+        return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(self.options,))
 
     def calculate_crc(self, data_bits):
         """
-        Oblicza sumę kontrolną CRC-8 dla podanego ciągu bitów (jako string '0'/'1').
-        Zwraca resztę z dzielenia modulo 2 (jako string bitów).
+        Oblicza sumę kontrolną CRC dla podanego ciągu bitów (jako string '0'/'1' lub BitBuffer).
+        Zwraca resztę z dzielenia modulo 2 (jako string bitów lub BitBuffer, zgodnie z typem wejścia).
+        """
+        if isinstance(data_bits, BitBuffer):
+            if self.crc_table is not None:
+                remainder = self.crc_table.remainder_bits(data_bits.to_int(), len(data_bits))
+                return BitBuffer.from_int(remainder, self.CRC_LENGTH)
+            return BitBuffer(self.calculate_crc_bitwise(data_bits.to_str()))
+        if self.crc_table is not None:
+            return self.crc_table.calculate(data_bits)
+        return self.calculate_crc_bitwise(data_bits)
+
+    def calculate_crc_bitwise(self, data_bits):
+        """
+        Oblicza CRC dzieleniem modulo 2 bit po bicie (wersja referencyjna, wolna).
         """
         # Dodajemy zera na końcu (długość wielomianu - 1)
         dividend = data_bits + "0" * (len(self.CRC_POLY) - 1)
@@ -55,53 +146,38 @@ class FrameProcessor:
     def bit_stuff(self, bits):
         """
         Realizuje rozpychanie bitów: po każdych 5 jedynkach wstawia zero.
-        Zwraca nowy ciąg bitów jako string.
+        Przyjmuje i zwraca ciąg bitów jako string; BitBuffer jest zamieniany na tekst po jednej ramce
+        (create_frame), bo wyrażenie regularne działa w C i jest szybsze niż przetwarzanie spakowanych bajtów w Pythonie.
         """
-        result = ""
-        count_ones = 0
-        
-        for bit in bits:
-            result += bit
-            if bit == '1':
-                count_ones += 1
-                if count_ones == 5:
-                    result += '0'  # Wstawiamy zero po 5 jedynkach
-                    count_ones = 0
-            else:
-                count_ones = 0
-        
-        return result
-    
+        # Nienakładające się dopasowania od lewej odpowiadają licznikowi jedynek zerowanemu po wstawieniu zera
+        return STUFF_PATTERN.sub("111110", bits)
+
+    def bit_stuff_with_positions(self, bits):
+        """
+        Jak bit_stuff, ale zwraca parę (wynik, pozycje wstawionych zer w wyniku).
+        """
+        # k-te dopasowanie jest przesunięte o k wcześniej wstawionych zer
+        positions = [match.end() + k for k, match in enumerate(STUFF_PATTERN.finditer(bits))]
+        return self.bit_stuff(bits), positions
+
     def bit_unstuff(self, bits):
         """
         Usuwa rozpychanie bitów: po każdych 5 jedynkach usuwa następujące zero.
-        Zwraca odtworzony ciąg bitów jako string.
+        Przyjmuje i zwraca ciąg bitów jako string (BitBuffer zamienia na tekst extract_frame_data, po jednej ramce).
         """
-        result = ""
-        count_ones = 0
-        i = 0
-        
-        while i < len(bits):
-            bit = bits[i]
-            result += bit
-            
-            if bit == '1':
-                count_ones += 1
-                if count_ones == 5:
-                    # Następny bit powinien być zerem do usunięcia
-                    if i + 1 < len(bits) and bits[i + 1] == '0':
-                        i += 1  # Pomijamy wstawione zero
-                    count_ones = 0
-            else:
-                count_ones = 0
-            
-            i += 1
-        
-        return result
-    
+        # Po 5 jedynkach licznik jest zerowany niezależnie od tego, czy następny bit był zerem
+        return UNSTUFF_PATTERN.sub("11111", bits)
+
+    def bit_unstuff_with_positions(self, bits):
+        """
+        Jak bit_unstuff, ale zwraca parę (wynik, pozycje usuniętych zer w ciągu wejściowym).
+        """
+        positions = [match.end() - 1 for match in UNSTUFF_PATTERN.finditer(bits) if match.group(1)]
+        return self.bit_unstuff(bits), positions
+
     def create_frame(self, data_chunk):
         """
-        Tworzy ramkę z podanego fragmentu danych
+        Tworzy ramkę z podanego fragmentu danych (string '0'/'1' lub BitBuffer)
         """
         if not data_chunk:
             return ""
@@ -112,43 +188,82 @@ class FrameProcessor:
         # 2. Połącz dane z CRC
         data_with_crc = data_chunk + crc
         
-        # 3. Zastosuj bit stuffing
-        stuffed_data = self.bit_stuff(data_with_crc)
+        # 3. Zastosuj bit stuffing (na tekście pojedynczej ramki)
+        if isinstance(data_with_crc, BitBuffer):
+            stuffed_data = BitBuffer(self.bit_stuff(data_with_crc.to_str()))
+        else:
+            stuffed_data = self.bit_stuff(data_with_crc)
         
         # 4. Dodaj flagi
         frame = self.FLAG + stuffed_data + self.FLAG
         
         return frame
     
-    def encode_file(self, input_file, output_file):
+    def split_data(self, chunks):
+        """
+        Generator fragmentów danych po FRAME_LENGTH bitów z kolejnych fragmentów wejścia (BitBuffer) dowolnej długości.
+        Niepełna końcówka fragmentu jest przenoszona do następnego; ostatni fragment może być krótszy.
+        """
+        pending = BitBuffer()
+        for chunk in chunks:
+            pending += chunk
+            complete = len(pending) - len(pending) % self.FRAME_LENGTH
+            for i in range(0, complete, self.FRAME_LENGTH):
+                yield pending[i:i+self.FRAME_LENGTH]
+            pending = pending[complete:]
+        if pending:
+            yield pending
+
+    def encode_stream(self, chunks, executor=None, batch_frames=BATCH_FRAMES):
+        """
+        Generator ramek: przyjmuje kolejne fragmenty danych (BitBuffer) dowolnej długości
+        i zwraca gotowe ramki, gdy tylko zbierze się FRAME_LENGTH bitów.
+        Jeśli podano pulę procesów (executor), ramki są tworzone równolegle partiami po batch_frames,
+        a kolejność wyników jest zachowana.
+        """
+        data_chunks = self.split_data(chunks)
+        if executor is None:
+            return map(self.create_frame, data_chunks)
+        batches = _map_batches(executor, _encode_batch, data_chunks, batch_frames)
+        return (frame for batch in batches for frame in batch)
+
+    def encode_bits(self, data):
+        """
+        Koduje BitBuffer z danymi do BitBuffer z ramkami (bez udziału plików).
+        Zwraca parę (zakodowany strumień, liczba ramek).
+        """
+        output_bits = BitBuffer()
+        frames = 0
+        for frame in self.encode_stream([data]):
+            output_bits += frame
+            frames += 1
+        return output_bits, frames
+
+    def encode_file(self, input_file, output_file, input_format="text", output_format="text", stream=False,
+                    chunk_bits=STREAM_CHUNK_BITS, jobs=1, header=True):
         """
         Koduje plik wejściowy do ramek z CRC, rozpychaniem bitów i flagami.
-        Zapisuje wynik do pliku wyjściowego jako jeden ciąg 0 i 1 (bez nowych linii).
+        Zapisuje wynik do pliku wyjściowego jako jeden ciąg 0 i 1 (bez nowych linii)
+        lub, dla output_format="bin", jako spakowane bity.
+        W trybie stream=True plik jest czytany fragmentami po chunk_bits bitów, a ramki zapisywane na bieżąco,
+        więc zużycie pamięci nie zależy od rozmiaru pliku. Dla jobs > 1 ramki są tworzone w puli procesów.
+        Przy header=True na początku pliku zapisywany jest nagłówek z konfiguracją (patrz header()).
         """
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                data = f.read().strip()
-            
-            # Sprawdź czy dane zawierają tylko 0 i 1
-            if not all(c in '01' for c in data):
-                raise ValueError("Plik źródłowy musi zawierać tylko znaki '0' i '1'")
-            
-            frames = []
-            
-            # Podziel dane na fragmenty
-            for i in range(0, len(data), self.FRAME_LENGTH):
-                chunk = data[i:i+self.FRAME_LENGTH]
-                frame = self.create_frame(chunk)
-                frames.append(frame)
-            
-            # Połącz wszystkie ramki w jeden ciąg
-            output_bits = ''.join(frames)
-            
-            # Zapisz do pliku jako jeden ciąg 0 i 1
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(output_bits)
-            
-            print(f"Kodowanie zakończone. Utworzono {len(frames)} ramek.")
+            # Wczytanie sprawdza, czy dane zawierają tylko 0 i 1
+            if stream:
+                chunks = iter_bits(input_file, input_format, chunk_bits)
+            else:
+                chunks = [read_bits(input_file, input_format)]
+
+            frames = 0
+            with self.executor(jobs) as executor, \
+                    BitWriter(output_file, output_format, self.header() if header else "") as writer:
+                for frame in self.encode_stream(chunks, executor):
+                    writer.write(frame)
+                    frames += 1
+
+            print(f"Kodowanie zakończone. Utworzono {frames} ramek.")
             print(f"Wynik zapisano do: {output_file}")
         
         except FileNotFoundError:
@@ -156,108 +271,337 @@ class FrameProcessor:
         except Exception as e:
             print(f"Błąd podczas kodowania: {e}")
     
-    def extract_frame_data(self, frame):
+    def extract_frame_data(self, frame, stats=None):
         """
-        Wyciąga dane z ramki i weryfikuje je
+        Wyciąga dane z ramki i weryfikuje je.
+        Jeśli podano stats (DecodeStats), doliczany jest czas usuwania rozpychania bitów i sprawdzania CRC.
         """
         # Usuń flagi
         if not (frame.startswith(self.FLAG) and frame.endswith(self.FLAG)):
-            return None, "Nieprawidłowe flagi ramki"
+            return None, STATUS_BAD_FLAGS
         
         content = frame[len(self.FLAG):-len(self.FLAG)]
         
         if not content:
-            return None, "Pusta ramka"
+            return None, STATUS_EMPTY
         
         # Usuń bit stuffing
+        started = time.perf_counter() if stats is not None else 0.0
         try:
-            destuffed = self.bit_unstuff(content)
+            if isinstance(content, BitBuffer):
+                destuffed = BitBuffer(self.bit_unstuff(content.to_str()))
+            else:
+                destuffed = self.bit_unstuff(content)
         except Exception as e:
             return None, f"Błąd podczas usuwania bit stuffing: {e}"
         
         if len(destuffed) < self.CRC_LENGTH:
-            return None, "Ramka zbyt krótka"
+            return None, STATUS_TOO_SHORT
         
         # Weryfikuj CRC
-        if not self.verify_crc(destuffed):
-            return None, "Błędne CRC"
+        if stats is not None:
+            unstuffed = time.perf_counter()
+            stats.timings["unstuff"] += unstuffed - started
+            crc_ok = self.verify_crc(destuffed)
+            stats.timings["crc"] += time.perf_counter() - unstuffed
+        else:
+            crc_ok = self.verify_crc(destuffed)
+        if not crc_ok:
+            return None, STATUS_CRC
         
         # Zwróć dane bez CRC
         data = destuffed[:-self.CRC_LENGTH]
-        return data, "OK"
+        return data, STATUS_OK
     
-    def decode_file(self, input_file, output_file):
+    def find_frames(self, chunks, max_frame_bits=MAX_FRAME_BITS, stats=None):
+        """
+        Generator ramek wyszukanych na podstawie flag: przyjmuje kolejne fragmenty strumienia (BitBuffer)
+        i zwraca pary (ramka razem z flagami, None) lub (None, status błędu).
+        Flagi są indeksowane w jednym przebiegu (FlagScanner), a granice ramek wyznacza FrameSpans.
+        W buforze zostają tylko bity od najwcześniejszej niezamkniętej ramki (lub możliwy początek flagi).
+        Ramka dłuższa niż max_frame_bits bez flagi zamykającej jest zgłaszana jako błędna,
+        dzięki czemu pamięć pozostaje ograniczona. Czas wyszukiwania flag jest doliczany do stats.
+        """
+        flag_len = len(self.FLAG)
+        scanner = FlagScanner(self.FLAG)
+        spans = FrameSpans(flag_len)
+        buf = BitBuffer()
+        base = 0  # pozycja początku bufora w całym strumieniu
+        for chunk in chunks:
+            started = time.perf_counter()
+            buf += chunk
+            found = [span for offset in scanner.feed(chunk) for span in spans.add(offset)]
+            if stats is not None:
+                stats.timings["flag_search"] += time.perf_counter() - started
+            for start, end in found:
+                yield buf[start - base:end - base], None
+
+            total = base + len(buf)
+            if max_frame_bits is not None:
+                while spans.first_pending is not None and total - spans.first_pending > max_frame_bits:
+                    spans.drop_first()
+                    yield None, STATUS_TOO_LONG
+
+            keep = spans.first_pending
+            if keep is None:
+                # Zostaw tylko bity, od których może zaczynać się flaga
+                keep = max(total - flag_len + 1, base)
+            buf = buf[keep - base:]
+            base = keep
+
+    def check_frame(self, found, stats=None):
+        """
+        Weryfikuje parę zwróconą przez find_frames; zwraca (dane lub None, status).
+        Jeśli podano stats (DecodeStats), ramka jest w nich zliczana.
+        """
+        frame, error = found
+        if frame is None:
+            data, status = None, error
+        else:
+            data, status = self.extract_frame_data(frame, stats)
+        if stats is not None:
+            stats.record(len(frame) if frame is not None else None, status, len(data) if data is not None else 0)
+        return data, status
+
+    def decode_stream(self, chunks, max_frame_bits=MAX_FRAME_BITS, executor=None, batch_frames=BATCH_FRAMES,
+                      stats=None):
+        """
+        Generator wyników dekodowania: przyjmuje kolejne fragmenty strumienia ramek (BitBuffer)
+        i dla każdej znalezionej ramki zwraca trójkę (numer ramki, dane lub None, status).
+        Jeśli podano pulę procesów (executor), ramki są weryfikowane równolegle partiami po batch_frames,
+        a kolejność wyników jest zachowana. Jeśli podano stats (DecodeStats), są w nich zbierane
+        liczniki, czasy etapów i histogram długości ramek (także z procesów roboczych).
+        """
+        found = self.find_frames(chunks, max_frame_bits, stats)
+        if executor is None:
+            results = (self.check_frame(item, stats) for item in found)
+        else:
+            results = _merge_batches(_map_batches(executor, _decode_batch, found, batch_frames), stats)
+        for frame_number, (data, status) in enumerate(results, 1):
+            yield frame_number, data, status
+
+    def decode_bits(self, bitstream, stats=None, verbose=False):
+        """
+        Dekoduje BitBuffer z ramkami: wyszukuje ramki na podstawie flag, usuwa flagi, rozpychanie bitów, weryfikuje CRC.
+        Zwraca trójkę (odtworzone dane jako BitBuffer, liczba poprawnych ramek, liczba wszystkich ramek).
+        Przy verbose=True wypisuje wynik dla każdej ramki.
+        """
+        decoded_data = BitBuffer()
+        valid_frames = 0
+        total_frames = 0
+        for frame_number, data, status in self.decode_stream([bitstream], max_frame_bits=None, stats=stats):
+            total_frames += 1
+            if data is not None:
+                decoded_data += data
+                valid_frames += 1
+            if verbose:
+                _print_frame(frame_number, status)
+        return decoded_data, valid_frames, total_frames
+
+    def decode_file(self, input_file, output_file, input_format="text", output_format="text", stream=False,
+                    chunk_bits=STREAM_CHUNK_BITS, jobs=1, verbose=False, stats_file=None):
         """
         Dekoduje plik ramek: wyszukuje ramki na podstawie flag, usuwa flagi, rozpychanie bitów, weryfikuje CRC.
         Zapisuje poprawne dane do pliku wyjściowego.
+        W trybie stream=True plik jest czytany fragmentami po chunk_bits bitów, a dane zapisywane na bieżąco.
+        Dla jobs > 1 ramki są weryfikowane w puli procesów.
+        Jeśli plik zaczyna się nagłówkiem z konfiguracją, musi ona zgadzać się z ustawieniami procesora.
+        Zwraca statystyki dekodowania (DecodeStats), opcjonalnie zapisywane do stats_file jako JSON;
+        wynik każdej ramki jest wypisywany tylko przy verbose=True.
         """
+        stats = DecodeStats()
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                bitstream = f.read().strip()
-
-            decoded_data = ""
-            valid_frames = 0
-            total_frames = 0
-            flag = self.FLAG
-            flag_len = len(flag)
-            i = 0
-            frames_found = 0
-            while True:
-                start = bitstream.find(flag, i)
-                if start == -1:
-                    break
-                end = bitstream.find(flag, start + flag_len)
-                if end == -1:
-                    break
-                frame = bitstream[start:end+flag_len]
-                # Pomijaj puste ramki
-                if len(frame) <= 2 * flag_len:
-                    i = bitstream.find(flag, start + 1)
-                    if i == -1:
-                        break
-                    continue
-                frames_found += 1
-                total_frames += 1
-                data, status = self.extract_frame_data(frame)
-                if data is not None:
-                    decoded_data += data
-                    valid_frames += 1
-                    print(f"Ramka {frames_found}: OK")
-                else:
-                    print(f"Ramka {frames_found}: BŁĄD - {status}")
-                # Always move to the next flag after the current start, to resync if opening flag is broken
-                i = bitstream.find(flag, start + 1)
-                if i == -1:
-                    break
+            config, offset = read_header(input_file)
+            if config is not None:
+                self.check_header(config)
+
+            if stream:
+                chunks = iter_bits(input_file, input_format, chunk_bits, offset)
+                max_frame_bits = MAX_FRAME_BITS
+            else:
+                chunks = [read_bits(input_file, input_format, offset)]
+                max_frame_bits = None
+
+            writer = None  # plik wyjściowy powstaje dopiero przy pierwszej poprawnej ramce
+            try:
+                with self.executor(jobs) as executor:
+                    for frame_number, data, status in self.decode_stream(chunks, max_frame_bits, executor,
+                                                                          stats=stats):
+                        if data is not None:
+                            if writer is None:
+                                writer = BitWriter(output_file, output_format)
+                            writer.write(data)
+                        if verbose:
+                            _print_frame(frame_number, status)
+            finally:
+                if writer is not None:
+                    writer.close()
 
+            valid_frames = stats.counters["frames_valid"]
             if valid_frames > 0:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(decoded_data)
                 print(f"\nDekodowanie zakończone.")
-                print(f"Prawidłowych ramek: {valid_frames}/{total_frames}")
+                print(f"Prawidłowych ramek: {valid_frames}/{stats.counters['frames_found']}")
+                if stats.errors:
+                    print(stats.summary())
                 print(f"Wynik zapisano do: {output_file}")
             else:
                 print("Brak prawidłowych ramek do zdekodowania.")
+            if stats_file:
+                stats.save_json(stats_file)
+                print(f"Statystyki zapisano do: {stats_file}")
         except FileNotFoundError:
             print(f"Błąd: Nie można odnaleźć pliku '{input_file}'")
         except Exception as e:
             print(f"Błąd podczas dekodowania: {e}")
+        return stats
 
 
-if __name__ == "__main__":
+# Procesor odtwarzany w każdym procesie roboczym puli (patrz FrameProcessor.executor)
+_worker_processor = None
+
+
+def _init_worker(options):
+    global _worker_processor
+    _worker_processor = FrameProcessor(**options)
+
+
+def _encode_batch(data_chunks):
+    return [_worker_processor.create_frame(chunk) for chunk in data_chunks]
+
+
+def _decode_batch(found_frames):
+    stats = DecodeStats()
+    return [_worker_processor.check_frame(found, stats) for found in found_frames], stats
+
+
+def _merge_batches(batches, stats):
+    """
+    Spłaszcza wyniki partii z _decode_batch, dołączając statystyki procesów roboczych do stats.
+    """
+    for results, batch_stats in batches:
+        if stats is not None:
+            stats.merge(batch_stats)
+        yield from results
+
+
+def _map_batches(executor, func, items, batch_size):
+    """
+    Wysyła elementy do puli procesów partiami po batch_size i zwraca wyniki kolejnych partii w kolejności wejścia.
+    Liczba partii w toku jest ograniczona do dwukrotności liczby rdzeni, więc pamięć pozostaje stała.
+    """
+    max_pending = 2 * (os.cpu_count() or 1)
+    pending = deque()
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            pending.append(executor.submit(func, batch))
+            batch = []
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+    if batch:
+        pending.append(executor.submit(func, batch))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _print_frame(frame_number, status):
+    if status == STATUS_OK:
+        print(f"Ramka {frame_number}: OK")
+    else:
+        print(f"Ramka {frame_number}: BŁĄD - {status}")
+
+
+def read_header(path):
+    """
+    Odczytuje nagłówek z konfiguracją z początku pliku.
+    Zwraca parę (słownik konfiguracji lub None, rozmiar nagłówka w bajtach).
+    """
+    with open(path, 'rb') as f:
+        line = f.readline(1024)
+    if not line.startswith(HEADER_TAG.encode('ascii')):
+        return None, 0
+
+    config = {}
+    for field in line.decode('ascii').split()[1:]:
+        key, _, value = field.partition("=")
+        config[key] = int(value) if key == "frame_length" else value
+    return config, len(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Kodowanie i dekodowanie ramek z sumą kontrolną CRC, bit stuffingiem i flagami.")
+    parser.add_argument("mode", choices=("encode", "decode", "tune"),
+                        help="tryb pracy; tune dobiera konfigurację dla próbki danych i zadanej stopy błędów")
+    parser.add_argument("input_file", help="plik wejściowy (dla tune: próbka danych)")
+    parser.add_argument("output_file", help="plik wyjściowy (dla tune: raport JSON)")
+    parser.add_argument("--input-format", choices=FORMATS, default="text",
+                        help="format pliku wejściowego: tekst '0'/'1' lub spakowane bity (domyślnie text)")
+    parser.add_argument("--output-format", choices=FORMATS, default="text",
+                        help="format pliku wyjściowego (domyślnie text)")
+    parser.add_argument("--crc-engine", choices=CRC_ENGINES, default="table",
+                        help="silnik CRC (domyślnie table)")
+    parser.add_argument("--frame-length", type=int,
+                        help=f"liczba bitów danych w ramce (domyślnie {DEFAULT_FRAME_LENGTH} lub z nagłówka pliku)")
+    parser.add_argument("--crc-poly",
+                        help=f"wielomian CRC jako ciąg bitów lub nazwa: {', '.join(CRC_POLYS)} "
+                             f"(domyślnie crc8 lub z nagłówka pliku)")
+    parser.add_argument("--flag", help=f"flaga ramki (domyślnie {DEFAULT_FLAG} lub z nagłówka pliku)")
+    parser.add_argument("--no-header", action="store_true",
+                        help="nie zapisuj nagłówka z konfiguracją w zakodowanym pliku")
+    parser.add_argument("--stream", action="store_true",
+                        help="przetwarzanie strumieniowe: czytanie fragmentami i zapis ramek na bieżąco")
+    parser.add_argument("--chunk-bits", type=int, default=STREAM_CHUNK_BITS,
+                        help=f"rozmiar fragmentu w trybie strumieniowym (domyślnie {STREAM_CHUNK_BITS})")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="liczba procesów do obliczania CRC i (roz)pychania bitów; 0 = liczba rdzeni (domyślnie 1)")
+    parser.add_argument("--verbose", action="store_true", help="decode: wypisuj wynik dla każdej ramki")
+    parser.add_argument("--stats-json", help="decode: zapisz statystyki dekodowania do pliku JSON")
+    parser.add_argument("--ber", type=float, default=1e-4,
+                        help="tune: docelowa stopa błędów bitowych łącza (domyślnie 1e-4)")
+    parser.add_argument("--tune-frame-lengths", type=int, nargs="+",
+                        help="tune: sprawdzane długości ramek")
+    parser.add_argument("--tune-crc-polys", nargs="+",
+                        help=f"tune: sprawdzane wielomiany CRC (domyślnie {' '.join(CRC_POLYS)})")
+    parser.add_argument("--trials", type=int, default=3, help="tune: liczba prób dla każdej konfiguracji")
+    parser.add_argument("--seed", type=int, default=0, help="tune: ziarno generatora błędów")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     # Obsługa argumentów wiersza poleceń
-    if len(sys.argv) < 4:
-        print("Użycie: python3 program.py encode|decode <plik_wejściowy> <plik_wyjściowy>")
-        sys.exit(1)
-    mode = sys.argv[1]
-    input_file = sys.argv[2]
-    output_file = sys.argv[3]
-    processor = FrameProcessor()
-    if mode == "encode":
-        processor.encode_file(input_file, output_file)
-        print(f"Zakodowano plik {input_file} do {output_file}")
-    elif mode == "decode":
-        processor.decode_file(input_file, output_file)
-        print(f"Zdekodowano plik {input_file} do {output_file}")
+    args = parse_args(argv)
+    if args.mode == "tune":
+        # Import lokalny, bo tuning.py sam korzysta z FrameProcessor
+        from tuning import tune_file
+        tune_file(args.input_file, args.output_file, args.input_format, args.ber, args.tune_frame_lengths,
+                  args.tune_crc_polys, args.flag or DEFAULT_FLAG, args.trials, args.seed)
+        return
+
+    # Jawnie podane parametry mają pierwszeństwo; przy dekodowaniu pozostałe są brane z nagłówka pliku
+    config = {"frame_length": DEFAULT_FRAME_LENGTH, "crc_poly": DEFAULT_CRC_POLY, "flag": DEFAULT_FLAG}
+    if args.mode == "decode":
+        try:
+            header_config, _ = read_header(args.input_file)
+        except OSError:
+            header_config = None
+        config.update({key: value for key, value in (header_config or {}).items() if key in config})
+    explicit = {"frame_length": args.frame_length, "crc_poly": args.crc_poly, "flag": args.flag}
+    config.update({key: value for key, value in explicit.items() if value is not None})
+
+    processor = FrameProcessor(crc_engine=args.crc_engine, **config)
+    if args.mode == "encode":
+        processor.encode_file(args.input_file, args.output_file, args.input_format, args.output_format,
+                              stream=args.stream, chunk_bits=args.chunk_bits, jobs=args.jobs,
+                              header=not args.no_header)
+        print(f"Zakodowano plik {args.input_file} do {args.output_file}")
     else:
-        print("Nieznany tryb. Użyj 'encode' lub 'decode'.")
\ No newline at end of file
+        processor.decode_file(args.input_file, args.output_file, args.input_format, args.output_format,
+                              stream=args.stream, chunk_bits=args.chunk_bits, jobs=args.jobs,
+                              verbose=args.verbose, stats_file=args.stats_json)
+        print(f"Zdekodowano plik {args.input_file} do {args.output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+stats.py - Zbiorcze statystyki dekodowania: liczniki ramek i błędów, czasy etapów oraz histogram długości ramek.
+Zastępują wypisywanie komunikatu dla każdej ramki; można je zwrócić jako obiekt lub zapisać do JSON.
+"""
+
+import json
+from collections import Counter
+
+# Statusy zwracane przez FrameProcessor.extract_frame_data / find_frames
+STATUS_OK = "OK"
+STATUS_BAD_FLAGS = "Nieprawidłowe flagi ramki"
+STATUS_EMPTY = "Pusta ramka"
+STATUS_TOO_SHORT = "Ramka zbyt krótka"
+STATUS_CRC = "Błędne CRC"
+STATUS_TOO_LONG = "Ramka zbyt długa"
+
+# Licznik odpowiadający statusowi; pozostałe błędy trafiają do other_errors
+_STATUS_COUNTERS = {
+    STATUS_OK: "frames_valid",
+    STATUS_BAD_FLAGS: "bad_flags",
+    STATUS_EMPTY: "empty_frames",
+    STATUS_TOO_SHORT: "too_short",
+    STATUS_CRC: "crc_errors",
+    STATUS_TOO_LONG: "too_long",
+}
+COUNTERS = ("frames_found", "frames_valid", "crc_errors", "bad_flags", "too_short", "empty_frames", "too_long",
+            "other_errors")
+STAGES = ("flag_search", "unstuff", "crc")
+
+
+class DecodeStats:
+    def __init__(self):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.timings = dict.fromkeys(STAGES, 0.0)  # sumaryczny czas etapów w sekundach
+        self.frame_lengths = Counter()  # długość ramki razem z flagami -> liczba ramek
+        self.decoded_bits = 0
+
+    def record(self, frame_length, status, data_length=0):
+        """
+        Zlicza jedną znalezioną ramkę (frame_length=None, jeśli ramki nie udało się wyciąć).
+        """
+        self.counters["frames_found"] += 1
+        self.counters[_STATUS_COUNTERS.get(status, "other_errors")] += 1
+        if frame_length is not None:
+            self.frame_lengths[frame_length] += 1
+        self.decoded_bits += data_length
+
+    def merge(self, other):
+        """
+        Dodaje statystyki z innego obiektu (np. zebrane w procesie roboczym).
+        """
+        for key, value in other.counters.items():
+            self.counters[key] += value
+        for key, value in other.timings.items():
+            self.timings[key] = self.timings.get(key, 0.0) + value
+        self.frame_lengths.update(other.frame_lengths)
+        self.decoded_bits += other.decoded_bits
+        return self
+
+    @property
+    def errors(self):
+        return self.counters["frames_found"] - self.counters["frames_valid"]
+
+    def to_dict(self):
+        return {
+            "counters": dict(self.counters),
+            "decoded_bits": self.decoded_bits,
+            "timings": dict(self.timings),
+            "frame_lengths": {str(length): count for length, count in sorted(self.frame_lengths.items())},
+        }
+
+    def save_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary(self):
+        """
+        Zwraca krótkie podsumowanie błędów w jednej linii.
+        """
+        parts = [f"{name}={self.counters[name]}" for name in COUNTERS[2:] if self.counters[name]]
+        return "Błędy: " + (", ".join(parts) if parts else "brak")
@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from bitbuffer import BitBuffer
+from crc import CRC_POLYS
+from program import FrameProcessor
+
+# Polynomials narrower than a byte exercise the widened register in CRCTable
+TEST_POLYS = [*CRC_POLYS.values(), '1011', '11']
+EDGE_LENGTHS = [0, 1, 7, 8, 9, 15, 16, 17]
+
+
+def payloads(rng):
+    lengths = EDGE_LENGTHS + [rng.randint(1, 400) for _ in range(30)]
+    for length in lengths:
+        yield ''.join(rng.choice('01') for _ in range(length))
+        yield '1' * length
+
+
+@pytest.mark.parametrize("poly", TEST_POLYS)
+def test_table_matches_bitwise(poly):
+    table = FrameProcessor(crc_engine='table', crc_poly=poly)
+    bitwise = FrameProcessor(crc_engine='bitwise', crc_poly=poly)
+    for data in payloads(random.Random(2024)):
+        expected = bitwise.calculate_crc(data)
+        assert table.calculate_crc(data) == expected, data
+        assert table.calculate_crc(BitBuffer(data)).to_str() == expected, data
+
+
+@pytest.mark.parametrize("poly", TEST_POLYS)
+def test_table_crc_verifies_frames(poly):
+    table = FrameProcessor(crc_engine='table', crc_poly=poly)
+    for data in payloads(random.Random(7)):
+        assert table.verify_crc(data + table.calculate_crc(data)), data
@@ -1,9 +1,13 @@
 import subprocess
 import os
+import tempfile
 from termcolor import colored
 
-# Paths
-SCRIPT = 'program.py'
+from flags import frame_spans
+from program import FrameProcessor, read_header
+
+# Paths (data files go to a temporary directory, so the tracked examples are not overwritten)
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'program.py')
 INPUT_FILE = 'test_input.txt'
 ENCODED_FILE = 'test_encoded.txt'
 DECODED_FILE = 'test_decoded.txt'
@@ -11,73 +15,62 @@ DECODED_FILE = 'test_decoded.txt'
 # Sample bit string (can be changed for more tests)
 BIT_STRING = '01111110111111000001111110000011111' * 220  # purposely includes many 1s for stuffing
 
-# Write input file
-print(colored('\n--- INPUT DATA ---', 'cyan'))
-print(BIT_STRING)
-with open(INPUT_FILE, 'w') as f:
-    f.write(BIT_STRING)
+def main(workdir):
+    input_file = os.path.join(workdir, INPUT_FILE)
+    encoded_file = os.path.join(workdir, ENCODED_FILE)
+    decoded_file = os.path.join(workdir, DECODED_FILE)
+
+    # Write input file
+    print(colored('\n--- INPUT DATA ---', 'cyan'))
+    print(BIT_STRING)
+    with open(input_file, 'w') as f:
+        f.write(BIT_STRING)
+
+    # Encode
+    subprocess.run(['python3', SCRIPT, 'encode', input_file, encoded_file], check=True)
 
-# Encode
-subprocess.run(['python3', SCRIPT, 'encode', INPUT_FILE, ENCODED_FILE], check=True)
+    # Read and print encoded output with color
+    processor = FrameProcessor()
+    print(colored('\n--- ENCODED FRAMES ---', 'cyan'))
+    _, header_size = read_header(encoded_file)  # skip the configuration header line
+    with open(encoded_file) as f:
+        f.seek(header_size)
+        bitstream = f.read().strip()
+        flag = processor.FLAG
+        for frame_num, (start, end) in enumerate(frame_spans(bitstream, flag), 1):
+            frame = bitstream[start:end]
+            content = frame[len(flag):-len(flag)]
+            print(colored(f'Frame {frame_num}: ', 'blue'), end='')
+            print(colored(flag, 'green'), end='')
+            # Color stuffed zeros (positions reported by the unstuffer)
+            _, stuffed_zeros = processor.bit_unstuff_with_positions(content)
+            stuffed_zeros = set(stuffed_zeros)
+            for idx, bit in enumerate(content):
+                if idx in stuffed_zeros:
+                    print(colored('0', 'red', attrs=['bold']), end='')
+                elif bit == '1':
+                    print(colored('1', 'yellow'), end='')
+                else:
+                    print('0', end='')
+            print(colored(flag, 'green'))
 
-# Read and print encoded output with color
-print(colored('\n--- ENCODED FRAMES ---', 'cyan'))
-with open(ENCODED_FILE) as f:
-    bitstream = f.read().strip()
-    flag = '01111110'
-    flag_len = len(flag)
-    i = 0
-    frame_num = 1
-    while i < len(bitstream):
-        start = bitstream.find(flag, i)
-        if start == -1:
-            break
-        end = bitstream.find(flag, start + flag_len)
-        if end == -1:
-            break
-        frame = bitstream[start:end+flag_len]
-        content = frame[len(flag):-len(flag)]
-        print(colored(f'Frame {frame_num}: ', 'blue'), end='')
-        print(colored(flag, 'green'), end='')
-        # Color stuffed zeros (after five 1s)
-        idx = 0
-        ones = 0
-        while idx < len(content):
-            bit = content[idx]
-            if bit == '1':
-                ones += 1
-                print(colored('1', 'yellow'), end='')
-                if ones == 5:
-                    # Next bit should be stuffed zero
-                    if idx+1 < len(content) and content[idx+1] == '0':
-                        print(colored('0', 'red', attrs=['bold']), end='')
-                        idx += 1
-                    ones = 0
-            else:
-                print('0', end='')
-                ones = 0
-            idx += 1
-        print(colored(flag, 'green'))
-        i = end + flag_len
-        frame_num += 1
+    # Decode
+    subprocess.run(['python3', SCRIPT, 'decode', encoded_file, decoded_file], check=True)
 
-# Decode
-subprocess.run(['python3', SCRIPT, 'decode', ENCODED_FILE, DECODED_FILE], check=True)
+    # Read and print decoded output
+    with open(decoded_file) as f:
+        decoded = f.read().strip()
 
-# Read and print decoded output
-with open(DECODED_FILE) as f:
-    decoded = f.read().strip()
+    print(colored('\n--- DECODED DATA ---', 'cyan'))
+    print(decoded)
 
-print(colored('\n--- DECODED DATA ---', 'cyan'))
-print(decoded)
+    # Compare
+    if decoded == BIT_STRING:
+        print(colored('\nSUCCESS: Decoded data matches original input!', 'green', attrs=['bold']))
+    else:
+        print(colored('\nFAIL: Decoded data does NOT match original input!', 'red', attrs=['bold']))
 
-# Compare
-if decoded == BIT_STRING:
-    print(colored('\nSUCCESS: Decoded data matches original input!', 'green', attrs=['bold']))
-else:
-    print(colored('\nFAIL: Decoded data does NOT match original input!', 'red', attrs=['bold']))
 
-# Cleanup (optional)
-# os.remove(INPUT_FILE)
-# os.remove(ENCODED_FILE)
-# os.remove(DECODED_FILE)
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as workdir:
+        main(workdir)
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from program import FrameProcessor
+
+RUN_LENGTHS = [5, 6, 7, 9, 10, 11, 15, 16]
+
+
+# Reference implementations: the bit-by-bit loops the regex versions replaced
+def loop_stuff(bits):
+    result = ''
+    count_ones = 0
+    for bit in bits:
+        result += bit
+        if bit == '1':
+            count_ones += 1
+            if count_ones == 5:
+                result += '0'
+                count_ones = 0
+        else:
+            count_ones = 0
+    return result
+
+
+def loop_unstuff(bits):
+    result = ''
+    count_ones = 0
+    i = 0
+    while i < len(bits):
+        bit = bits[i]
+        result += bit
+        if bit == '1':
+            count_ones += 1
+            if count_ones == 5:
+                if i + 1 < len(bits) and bits[i + 1] == '0':
+                    i += 1
+                count_ones = 0
+        else:
+            count_ones = 0
+        i += 1
+    return result
+
+
+def run_cases():
+    cases = ['', '0', '1', '1111', '0000']
+    for run in RUN_LENGTHS:
+        ones = '1' * run
+        # Runs at the start, at the end, in the middle and back to back
+        cases += [ones, ones + '0', '0' + ones, '0' + ones + '0', ones + '0' + ones, ones + '00' + ones,
+                  ones + '10' + ones, '010' + ones + '1' + ones]
+    return cases
+
+
+def random_cases():
+    rng = random.Random(2024)
+    return [''.join(rng.choice('0111') for _ in range(rng.randint(1, 120))) for _ in range(200)]
+
+
+@pytest.fixture
+def processor():
+    return FrameProcessor()
+
+
+@pytest.mark.parametrize("bits", run_cases())
+def test_stuffing_matches_loop_on_runs(processor, bits):
+    stuffed = processor.bit_stuff(bits)
+    assert stuffed == loop_stuff(bits)
+    assert processor.bit_unstuff(bits) == loop_unstuff(bits)
+    assert processor.bit_unstuff(stuffed + '1') == loop_unstuff(stuffed + '1')
+    assert processor.bit_unstuff(stuffed) == bits
+
+
+def test_stuffing_matches_loop_on_random_bits(processor):
+    for bits in random_cases():
+        stuffed = processor.bit_stuff(bits)
+        assert stuffed == loop_stuff(bits), bits
+        assert processor.bit_unstuff(bits) == loop_unstuff(bits), bits
+        assert processor.bit_unstuff(stuffed) == bits, bits
+
+
+@pytest.mark.parametrize("bits", run_cases() + random_cases()[:20])
+def test_stuffed_zero_positions(processor, bits):
+    stuffed, positions = processor.bit_stuff_with_positions(bits)
+    inserted = set(positions)
+    assert all(stuffed[position] == '0' for position in positions)
+    assert ''.join(bit for index, bit in enumerate(stuffed) if index not in inserted) == bits
+    assert processor.bit_unstuff_with_positions(stuffed) == (bits, positions)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+tuning.py - Dobór długości ramki i wielomianu CRC dla zadanej stopy błędów bitowych (BER).
+Dla każdej konfiguracji próbka danych jest kodowana, przesyłana przez kanał z losowymi przekłamaniami
+i dekodowana; mierzona jest efektywna przepustowość (goodput), czyli liczba poprawnie dostarczonych
+bitów danych na jeden przesłany bit.
+"""
+
+import json
+import math
+import random
+
+from bitbuffer import BitBuffer, read_bits
+from crc import CRC_POLYS, resolve_poly
+from program import FrameProcessor
+
+DEFAULT_FRAME_LENGTHS = (32, 64, 150, 256, 512, 1024, 2048, 4096)
+
+
+def inject_bit_errors(bitstream, ber, rng):
+    """
+    Zwraca kopię strumienia, w której każdy bit jest niezależnie przekłamany z prawdopodobieństwem ber.
+    Odstępy między błędami są losowane z rozkładu geometrycznego, więc koszt zależy od liczby błędów.
+    """
+    if ber <= 0:
+        return bitstream.copy()
+    data = bytearray(bitstream.to_bytes())
+    log_keep = math.log1p(-ber) if ber < 1 else None
+    position = -1
+    while True:
+        if log_keep is None:
+            position += 1
+        else:
+            position += int(math.log(1.0 - rng.random()) / log_keep) + 1
+        if position >= len(bitstream):
+            break
+        data[position >> 3] ^= 0x80 >> (position & 7)
+    return BitBuffer.from_bytes(data, len(bitstream))
+
+
+def measure_goodput(sample, frame_length, crc_poly, flag, ber, trials, rng):
+    """
+    Zwraca słownik z wynikami jednej konfiguracji. Ramka przyjęta przez dekoder liczy się jako dostarczona
+    tylko wtedy, gdy jej dane są identyczne z kolejną (w kolejności wysyłania) ramką oryginału; ramki
+    powtórzone, przestawione lub nadmiarowe są liczone jako niewykryte błędy, a brakujące jako utracone.
+    """
+    processor = FrameProcessor(frame_length=frame_length, crc_poly=crc_poly, flag=flag)
+    chunks = list(processor.split_data([sample]))
+    encoded, frames = processor.encode_bits(sample)
+
+    delivered_bits = 0
+    delivered = 0
+    undetected = 0
+    for _ in range(trials):
+        received = inject_bit_errors(encoded, ber, rng)
+        # Numer ramki z dekodera przesuwa się po przekłamaniu flagi (ramki sklejone lub rozdzielone),
+        # więc ramki są dopasowywane do oryginału po kolei: pominięte ramki oryginału są utracone
+        position = 0
+        for _, data, _ in processor.decode_stream([received], max_frame_bits=None):
+            if data is None:
+                continue
+            index = next((i for i in range(position, len(chunks)) if chunks[i] == data), None)
+            if index is None:
+                undetected += 1
+            else:
+                delivered += 1
+                delivered_bits += len(data)
+                position = index + 1
+
+    transmitted_bits = len(encoded) * trials
+    return {
+        "frame_length": frame_length,
+        "crc_poly": processor.CRC_POLY,
+        "crc_length": processor.CRC_LENGTH,
+        "frames": frames,
+        "overhead": len(encoded) / len(sample) - 1,
+        "frame_loss": 1 - delivered / (frames * trials),
+        "undetected_errors": undetected,
+        "goodput": delivered_bits / transmitted_bits,
+    }
+
+
+def tune(sample, ber, frame_lengths=None, crc_polys=None, flag="01111110", trials=3, seed=0):
+    """
+    Sprawdza wszystkie kombinacje długości ramki i wielomianu CRC.
+    Zwraca listę wyników posortowaną malejąco według goodput (pierwszy element to zalecana konfiguracja).
+    """
+    if not len(sample):
+        raise ValueError("Próbka danych jest pusta")
+    rng = random.Random(seed)
+    results = []
+    for crc_poly in crc_polys or CRC_POLYS:
+        for frame_length in frame_lengths or DEFAULT_FRAME_LENGTHS:
+            results.append(measure_goodput(sample, frame_length, resolve_poly(crc_poly), flag, ber, trials, rng))
+    # Przy remisie wygrywa konfiguracja z mniejszą liczbą niewykrytych błędów, potem szerszym CRC
+    results.sort(key=lambda r: (-r["goodput"], r["undetected_errors"], -r["crc_length"]))
+    return results
+
+
+def tune_file(sample_file, report_file, input_format="text", ber=1e-4, frame_lengths=None, crc_polys=None,
+              flag="01111110", trials=3, seed=0):
+    """
+    Uruchamia tune() dla próbki z pliku, wypisuje tabelę wyników i zapisuje raport JSON.
+    """
+    try:
+        sample = read_bits(sample_file, input_format)
+        results = tune(sample, ber, frame_lengths, crc_polys, flag, trials, seed)
+    except FileNotFoundError:
+        print(f"Błąd: Nie można odnaleźć pliku '{sample_file}'")
+        return None
+    except Exception as e:
+        print(f"Błąd podczas strojenia: {e}")
+        return None
+
+    names = {poly: name for name, poly in CRC_POLYS.items()}
+    print(f"{'ramka':>6} {'CRC':>6} {'narzut':>8} {'utracone':>9} {'niewykryte':>10} {'goodput':>8}")
+    for r in results:
+        crc_name = names.get(r["crc_poly"], f"{r['crc_length']}b")
+        print(f"{r['frame_length']:>6} {crc_name:>6} {r['overhead']:>8.3f} {r['frame_loss']:>9.3%} "
+              f"{r['undetected_errors']:>10} {r['goodput']:>8.4f}")
+
+    best = results[0]
+    print(f"\nZalecana konfiguracja dla BER={ber}: --frame-length {best['frame_length']} "
+          f"--crc-poly {names.get(best['crc_poly'], best['crc_poly'])}")
+
+    report = {"ber": ber, "sample_bits": len(sample), "trials": trials, "seed": seed, "flag": flag,
+              "recommended": best, "results": results}
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Raport zapisano do: {report_file}")
+    return best
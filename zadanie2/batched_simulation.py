@@ -0,0 +1,209 @@
+import numpy as np
+
+from device import Device
+
+RECEIVING = Device.State.RECEIVING.value
+TRANSMITTING = Device.State.TRANSMITTING.value
+WAITING_FOR_WIRE = Device.State.WAITING_FOR_WIRE.value
+JAMMING = Device.State.JAMMING.value
+WAITING_BACK_OFF_TIME = Device.State.WAITING_BACK_OFF_TIME.value
+
+NO_SIGNAL = 0
+DATA_SIGNAL = 1
+JAM_SIGNAL = 2
+
+_JAM_ID = 2
+_FIRST_DEVICE_ID = 3
+_NEVER = np.iinfo(np.int64).max
+
+
+class BatchedSimulation:
+    def __init__(self, runs: int, wire_length: int, positions: list[int], probability: float, rng: np.random.Generator) -> None:
+        if not all(0 <= position <= wire_length - 1 for position in positions):
+            raise Exception(f"Position in wire has to be a number in range [0, {wire_length - 1}].")
+
+        self._runs = runs
+        self._length = wire_length
+        self._positions = np.array(positions, dtype=np.int64)
+        self._has_shared_positions = len(set(positions)) != len(positions)
+        self._min_packet_time = 2 * wire_length
+        self._probability = probability
+        self._rng = rng
+        self._tick = 0
+
+        shape = (runs, len(positions))
+        self._states = np.full(shape, RECEIVING, dtype=np.int8)
+        self._tick_counters = np.zeros(shape, dtype=np.int64)
+        self._failed_attempts = np.zeros(shape, dtype=np.int64)
+        self._backoff_waiting_ticks = np.zeros(shape, dtype=np.int64)
+        self._is_ready_to_transmit = np.ones(shape, dtype=bool)
+        self._successfull_transmissions = np.zeros(shape, dtype=np.int64)
+        self._failed_transmissions = np.zeros(shape, dtype=np.int64)
+        self._queued_packets = np.zeros(shape, dtype=np.int64)
+        self._next_arrivals = np.full(shape, -1, dtype=np.int64)
+        self._draw_arrivals(np.ones(shape, dtype=bool), -1)
+        self._aborted = np.zeros(runs, dtype=bool)
+        self._abort_ticks = np.full(runs, -1, dtype=np.int64)
+
+        self._symbol_ids = np.arange(len(positions), dtype=np.int32) + _FIRST_DEVICE_ID
+        self._occupancy = np.zeros((runs, 3, wire_length), dtype=np.int32)
+        self._right_edges = np.zeros((runs, 3, wire_length), dtype=np.int32)
+        self._left_edges = np.zeros((runs, 3, wire_length), dtype=np.int32)
+        self._emissions = np.zeros((self._min_packet_time, *shape), dtype=np.int8)
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick
+
+    @property
+    def successfull_transmissions(self) -> np.ndarray:
+        return self._successfull_transmissions
+
+    @property
+    def failed_transmissions(self) -> np.ndarray:
+        return self._failed_transmissions
+
+    @property
+    def queued_packets(self) -> np.ndarray:
+        return self._queued_packets
+
+    @property
+    def aborted(self) -> np.ndarray:
+        return self._aborted
+
+    @property
+    def abort_ticks(self) -> np.ndarray:
+        return self._abort_ticks
+
+    def _draw_arrivals(self, mask: np.ndarray, tick: int) -> None:
+        count = int(mask.sum())
+        if not count:
+            return
+        if self._probability >= 1:
+            gaps = np.ones(count, dtype=np.int64)
+        elif self._probability <= 0:
+            self._next_arrivals[mask] = _NEVER
+            return
+        else:
+            gaps = self._rng.geometric(self._probability, size=count)
+        self._next_arrivals[mask] = tick + gaps
+
+    def run(self, ticks: int) -> None:
+        for _ in range(ticks):
+            self.tick()
+
+    def tick(self) -> None:
+        observed = self._occupancy[:, :, self._positions]
+        count, jam_count, symbol_id_sum = observed[:, 0], observed[:, 1], observed[:, 2]
+        collision = ~((count == 0) | ((count == 1) & (symbol_id_sum == self._symbol_ids)))
+        jammed = jam_count > 0
+
+        previous = self._device_arrays() if (self._failed_attempts == Device._MAX_FAILED_ATTEMPTS - 1).any() else None
+        emissions = np.zeros(self._states.shape, dtype=np.int8)
+        alive = ~self._aborted[:, None]
+
+        arrivals = (self._next_arrivals == self._tick) & alive
+        self._draw_arrivals(arrivals, self._tick)
+        self._queued_packets[arrivals] += 1
+        starting = (self._states == RECEIVING) & (self._queued_packets > 0) & alive
+        self._queued_packets[starting] -= 1
+        self._send_packet(starting, collision, emissions)
+
+        states = self._states
+        transmitting = (states == TRANSMITTING) & alive
+        waiting_for_wire = (states == WAITING_FOR_WIRE) & alive
+        jamming = (states == JAMMING) & alive
+        waiting_back_off_time = (states == WAITING_BACK_OFF_TIME) & alive
+
+        collided = transmitting & collision
+        back_off = collided & jammed
+        start_jam = collided & ~jammed
+        states[start_jam] = JAMMING
+        emissions[start_jam] = JAM_SIGNAL
+        self._tick_counters[start_jam] = 0
+
+        clean = transmitting & ~collision
+        self._tick_counters[clean] += 1
+        done = clean & (self._tick_counters == self._min_packet_time)
+        states[done] = RECEIVING
+        self._is_ready_to_transmit[done] = True
+        self._failed_attempts[done] = 0
+        self._successfull_transmissions[done] += 1
+
+        self._send_packet(waiting_for_wire, collision, emissions)
+
+        self._tick_counters[jamming] += 1
+        back_off |= jamming & (self._tick_counters == self._min_packet_time)
+
+        self._backoff_waiting_ticks[waiting_back_off_time] -= 1
+        expired = waiting_back_off_time & (self._backoff_waiting_ticks <= 0)
+        self._is_ready_to_transmit[expired] = True
+        states[expired] = WAITING_FOR_WIRE
+
+        aborting = self._calculate_wait_time(back_off)
+        if aborting.any():
+            self._abort(aborting, previous, emissions)
+
+        self._update_wire(emissions)
+        self._tick += 1
+
+    def _send_packet(self, mask: np.ndarray, collision: np.ndarray, emissions: np.ndarray) -> None:
+        attempt = mask & self._is_ready_to_transmit
+        self._states[attempt & collision] = WAITING_FOR_WIRE
+        start = attempt & ~collision
+        self._states[start] = TRANSMITTING
+        self._tick_counters[start] = 0
+        emissions[start] = DATA_SIGNAL
+        self._is_ready_to_transmit[start] = False
+
+    def _calculate_wait_time(self, mask: np.ndarray) -> np.ndarray:
+        self._states[mask] = WAITING_BACK_OFF_TIME
+        self._failed_attempts[mask] += 1
+        self._failed_transmissions[mask] += 1
+        aborting = mask & (self._failed_attempts == Device._MAX_FAILED_ATTEMPTS)
+        waiting = mask & ~aborting
+        k = np.minimum(self._failed_attempts[waiting], 10)
+        self._backoff_waiting_ticks[waiting] = self._rng.integers(1, 2**k + 1) * self._min_packet_time
+        return aborting
+
+    def _device_arrays(self) -> tuple[np.ndarray, ...]:
+        return (self._states.copy(), self._tick_counters.copy(), self._failed_attempts.copy(), self._backoff_waiting_ticks.copy(),
+                self._is_ready_to_transmit.copy(), self._successfull_transmissions.copy(), self._failed_transmissions.copy(),
+                self._queued_packets.copy())
+
+    def _abort(self, aborting: np.ndarray, previous: tuple[np.ndarray, ...] | None, emissions: np.ndarray) -> None:
+        runs = aborting.any(axis=1)
+        first_device = np.argmax(aborting, axis=1)
+        rolled_back = runs[:, None] & (np.arange(aborting.shape[1]) > first_device[:, None])
+        for current, old in zip(
+            (self._states, self._tick_counters, self._failed_attempts, self._backoff_waiting_ticks, self._is_ready_to_transmit,
+             self._successfull_transmissions, self._failed_transmissions, self._queued_packets),
+            previous,
+        ):
+            current[rolled_back] = old[rolled_back]
+        emissions[runs] = NO_SIGNAL
+        self._aborted |= runs
+        self._abort_ticks[runs] = self._tick
+
+    def _signal_values(self, emissions: np.ndarray) -> np.ndarray:
+        is_signal = emissions != NO_SIGNAL
+        is_jam = emissions == JAM_SIGNAL
+        symbol_ids = np.where(is_jam, _JAM_ID, self._symbol_ids) * is_signal
+        return np.stack((is_signal, is_jam, symbol_ids), axis=1).astype(np.int32)
+
+    def _update_wire(self, emissions: np.ndarray) -> None:
+        self._right_edges[:, :, 1:] = self._right_edges[:, :, :-1]
+        self._right_edges[:, :, 0] = 0
+        self._left_edges[:, :, :-1] = self._left_edges[:, :, 1:]
+        self._left_edges[:, :, -1] = 0
+        self._occupancy += self._right_edges
+        self._occupancy += self._left_edges
+
+        slot = self._tick % self._min_packet_time
+        delta = self._signal_values(emissions) - self._signal_values(self._emissions[slot])
+        self._emissions[slot] = emissions
+        for array in (self._occupancy, self._right_edges, self._left_edges):
+            if self._has_shared_positions:
+                np.add.at(array, (slice(None), slice(None), self._positions), delta)
+            else:
+                array[:, :, self._positions] += delta
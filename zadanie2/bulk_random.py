@@ -0,0 +1,38 @@
+import random
+from itertools import chain
+from typing import Iterator
+
+import numpy as np
+
+CHUNK_SIZE = 4096
+
+
+class BulkRandom(random.Random):
+    def __init__(self, generator: np.random.Generator, chunk_size: int = CHUNK_SIZE, values: list[float] | None = None) -> None:
+        super().__init__()
+        self._generator = generator
+        self._chunk_size = chunk_size
+        self._start(values or [])
+
+    def _start(self, values: list[float]) -> None:
+        self._current = iter(values)
+        self.random = chain(self._current, chain.from_iterable(self._chunks())).__next__
+
+    def _chunks(self) -> Iterator[Iterator[float]]:
+        while True:
+            self._current = iter(self._generator.random(self._chunk_size).tolist())
+            yield self._current
+
+    def seed(self, a=None, version: int = 2) -> None:
+        super().seed(a, version)
+        if a is not None:
+            self._generator = np.random.default_rng(random.Random(a).getrandbits(128))
+            self._start([])
+
+    def randint(self, a: int, b: int) -> int:
+        return a + int(self.random() * (b - a + 1))
+
+    def __reduce__(self):
+        values = list(self._current)
+        self._start(values)
+        return BulkRandom, (self._generator, self._chunk_size, values)
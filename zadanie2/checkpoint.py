@@ -0,0 +1,69 @@
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+MAGIC = b"CSCK"
+VERSION = 1
+HEADER = struct.Struct("<4sBQ")
+
+COMPRESSION_LEVEL = 6
+
+
+def encode_checkpoint(tick: int, state: dict) -> bytes:
+    return pickle.dumps((tick, state), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _write_checkpoint(path: str, tick: int, data: bytes) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as checkpoint_file:
+        checkpoint_file.write(HEADER.pack(MAGIC, VERSION, tick))
+        checkpoint_file.write(zlib.compress(data, COMPRESSION_LEVEL))
+    os.replace(temporary_path, path)
+
+
+def save_checkpoint(path: str, tick: int, state: dict) -> None:
+    _write_checkpoint(path, tick, encode_checkpoint(tick, state))
+
+
+def load_checkpoint(path: str) -> tuple[int, dict]:
+    with open(path, "rb") as checkpoint_file:
+        magic, version, tick = HEADER.unpack(checkpoint_file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' is not a simulation checkpoint.")
+        return pickle.loads(zlib.decompress(checkpoint_file.read()))
+
+
+class CheckpointWriter:
+    def __init__(self, path: str, interval: int) -> None:
+        self._path = path
+        self._interval = interval
+        self._thread: threading.Thread | None = None
+
+    @property
+    def interval(self) -> int:
+        return self._interval
+
+    def is_due(self, tick: int) -> bool:
+        return self._interval > 0 and tick % self._interval == 0
+
+    def write(self, tick: int, state: dict) -> None:
+        data = encode_checkpoint(tick, state)
+        self.wait()
+        self._thread = threading.Thread(target=_write_checkpoint, args=(self._path, tick, data), daemon=True)
+        self._thread.start()
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        self.wait()
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
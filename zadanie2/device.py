@@ -1,9 +1,15 @@
+import math
 import random
+from collections import deque
 from enum import Enum
 
 from wire import Wire
 
 
+class TooManyAttemptsError(Exception):
+    pass
+
+
 class Device:
     class State(Enum):
         RECEIVING = 0
@@ -14,13 +20,14 @@ class Device:
 
     _MAX_FAILED_ATTEMPTS = 16
 
-    def __init__(self, symbol: str, wire: Wire, position_in_wire: int) -> None:
+    def __init__(self, symbol: str, wire: Wire, position_in_wire: int, rng: random.Random | None = None) -> None:
         if not wire.is_position_valid(position_in_wire):
             raise Exception(f"Position in wire has to be a number in range [0, {wire.length - 1}].")
 
         self._symbol = symbol
         self._wire = wire
         self._position_in_wire = position_in_wire
+        self._rng = rng if rng is not None else random.Random()
 
         self._min_packet_time = 2 * wire.length
         self._tick_counter = 0
@@ -28,10 +35,17 @@ class Device:
         self._backoff_waiting_ticks = 0
         self._state = self.State.RECEIVING
         self._is_ready_to_transmit = True
+        self._queued_packets = 0
+        self._is_saturated = False
+        self._frames = deque()
+        self._frame = None
+        self._packet_time = self._min_packet_time
 
         self._successfull_transmissions = 0
         self._failed_transmissions = 0
 
+        self.observer = None
+
     @property
     def successfull_transmissions(self) -> int:
         return self._successfull_transmissions
@@ -40,10 +54,72 @@ class Device:
     def failed_transmissions(self) -> int:
         return self._failed_transmissions
 
+    @property
+    def position_in_wire(self) -> int:
+        return self._position_in_wire
+
+    @property
+    def queued_packets(self) -> int:
+        return self._queued_packets + len(self._frames)
+
+    @property
+    def packet_time(self) -> int:
+        return self._packet_time
+
+    @property
+    def rng(self) -> random.Random:
+        return self._rng
+
+    @property
+    def symbol(self) -> str:
+        return self._symbol
+
+    @property
+    def state(self) -> State:
+        return self._state
+
+    @property
+    def min_packet_time(self) -> int:
+        return self._min_packet_time
+
     def _change_state(self, state: State) -> None:
+        if self.observer is not None and state != self._state:
+            self.observer.on_state_change(self, self._state, state)
         self._state = state
 
+    def queue_packets(self, count: int = 1) -> None:
+        self._queued_packets += count
+        if self.observer is not None:
+            self.observer.on_packets_queued(self, count)
+
+    def queue_frame(self, frame) -> None:
+        self._frames.append(frame)
+        if self.observer is not None:
+            self.observer.on_packets_queued(self, 1)
+
+    def saturate(self, is_saturated: bool = True) -> None:
+        self._is_saturated = is_saturated
+
+    def _has_queued_packet(self) -> bool:
+        return self._queued_packets > 0 or bool(self._frames) or self._is_saturated
+
+    def _start_queued_packet(self) -> None:
+        if self._frames:
+            self._frame = self._frames.popleft()
+            self._packet_time = max(self._min_packet_time, len(self._frame))
+        else:
+            self._frame = None
+            self._packet_time = self._min_packet_time
+            if self._queued_packets:
+                self._queued_packets -= 1
+        if self.observer is not None:
+            self.observer.on_packet_dequeued(self)
+        self.send_packet()
+
     def tick(self) -> None:
+        if self._state == self.State.RECEIVING and self._has_queued_packet():
+            self._start_queued_packet()
+
         if self._state == self.State.TRANSMITTING:
             self._transmit()
         elif self._state == self.State.WAITING_FOR_WIRE:
@@ -53,6 +129,25 @@ class Device:
         elif self._state == self.State.WAITING_BACK_OFF_TIME:
             self._wait_back_off_time()
 
+    def ticks_to_next_change(self) -> float:
+        if self._state == self.State.TRANSMITTING:
+            if self._wire.is_collision(self._position_in_wire, self._symbol):
+                return 1
+            return self._packet_time - self._tick_counter
+        elif self._state == self.State.WAITING_FOR_WIRE:
+            return math.inf if self._wire.is_collision(self._position_in_wire, self._symbol) else 1
+        elif self._state == self.State.JAMMING:
+            return self._min_packet_time - self._tick_counter
+        elif self._state == self.State.WAITING_BACK_OFF_TIME:
+            return self._backoff_waiting_ticks
+        return 1 if self._has_queued_packet() else math.inf
+
+    def skip_idle_ticks(self, ticks: int) -> None:
+        if self._state == self.State.TRANSMITTING or self._state == self.State.JAMMING:
+            self._tick_counter += ticks
+        elif self._state == self.State.WAITING_BACK_OFF_TIME:
+            self._backoff_waiting_ticks -= ticks
+
     def send_packet(self) -> None:
         if self._is_ready_to_transmit:
             if self._wire.is_collision(self._position_in_wire, self._symbol):
@@ -60,7 +155,7 @@ class Device:
             else:
                 self._change_state(self.State.TRANSMITTING)
                 self._tick_counter = 0
-                self._wire.send_signal(self._position_in_wire, self._symbol, self._min_packet_time)
+                self._wire.send_signal(self._position_in_wire, self._symbol, self._packet_time)
                 self._is_ready_to_transmit = False
 
     def _transmit(self) -> None:
@@ -74,11 +169,13 @@ class Device:
                 self._tick_counter = 0
         else:
             self._tick_counter += 1
-            if self._tick_counter == self._min_packet_time:
+            if self._tick_counter == self._packet_time:
                 self._change_state(self.State.RECEIVING)
                 self._is_ready_to_transmit = True
                 self._failed_attempts = 0
                 self._successfull_transmissions += 1
+                if self.observer is not None:
+                    self.observer.on_packet_sent(self, self._frame)
 
     def _jam(self) -> None:
         self._tick_counter += 1
@@ -96,6 +193,8 @@ class Device:
         self._failed_attempts += 1
         self._failed_transmissions += 1
         if self._failed_attempts == self._MAX_FAILED_ATTEMPTS:
-            raise Exception("Too many failed attempts.")
+            raise TooManyAttemptsError("Too many failed attempts.")
         k = min(self._failed_attempts, 10)
-        self._backoff_waiting_ticks = random.randint(1, 2**k) * self._min_packet_time
+        self._backoff_waiting_ticks = self._rng.randint(1, 2**k) * self._min_packet_time
+        if self.observer is not None:
+            self.observer.on_backoff(self, self._failed_attempts, self._backoff_waiting_ticks)
@@ -0,0 +1,155 @@
+import heapq
+import math
+from typing import Callable
+
+from device import Device
+from metrics import SimulationObserver
+from simulation import create_schedules
+from traffic import BernoulliTraffic, TrafficSource
+from wire import Wire
+
+
+def linear_distance(source: int, target: int) -> int:
+    return abs(target - source)
+
+
+class EventWire:
+    DEFAULT_SIGNAL_SYMBOL = Wire.DEFAULT_SIGNAL_SYMBOL
+    OVERLAPPING_SIGNAL_SYMBOL = Wire.OVERLAPPING_SIGNAL_SYMBOL
+    JAM_SIGNAL_SYMBOL = Wire.JAM_SIGNAL_SYMBOL
+
+    def __init__(self, length: int, observed_positions: list[int], distance: Callable[[int, int], int] | None = None) -> None:
+        self._length = length
+        self._distance = distance or linear_distance
+        self._tick = 0
+        self._changes: list[tuple[int, int, int, str]] = []
+        self._signals: dict[int, dict[str, int]] = {position: {} for position in observed_positions}
+        self._symbols = {position: self.DEFAULT_SIGNAL_SYMBOL for position in observed_positions}
+
+    @property
+    def length(self) -> int:
+        return self._length
+
+    def is_position_valid(self, position: int) -> bool:
+        return 0 <= position <= self.length - 1
+
+    def next_change_tick(self) -> float:
+        return self._changes[0][0] if self._changes else math.inf
+
+    def advance_to(self, tick: int) -> set[int]:
+        self._tick = tick
+        touched = set()
+        while self._changes and self._changes[0][0] <= tick:
+            _, position, delta, symbol = heapq.heappop(self._changes)
+            signals = self._signals[position]
+            signals[symbol] = signals.get(symbol, 0) + delta
+            if not signals[symbol]:
+                del signals[symbol]
+            touched.add(position)
+
+        changed = set()
+        for position in touched:
+            symbol = self._segment_symbol(self._signals[position])
+            if symbol != self._symbols[position]:
+                self._symbols[position] = symbol
+                changed.add(position)
+        return changed
+
+    def _segment_symbol(self, signals: dict[str, int]) -> str:
+        count = sum(signals.values())
+        if count == 0:
+            return self.DEFAULT_SIGNAL_SYMBOL
+        if count == 1:
+            return next(iter(signals))
+        if self.JAM_SIGNAL_SYMBOL in signals:
+            return self.JAM_SIGNAL_SYMBOL
+        return self.OVERLAPPING_SIGNAL_SYMBOL
+
+    def send_signal(self, device_position: int, signal_symbol: str, tick_lifetime: int) -> None:
+        if tick_lifetime <= 0:
+            return
+        for position in self._signals:
+            arrival = self._tick + self._distance(device_position, position) + 1
+            heapq.heappush(self._changes, (arrival, position, 1, signal_symbol))
+            heapq.heappush(self._changes, (arrival + tick_lifetime, position, -1, signal_symbol))
+
+    def send_jam_signal(self, device_position: int, tick_lifetime: int) -> None:
+        self.send_signal(device_position, self.JAM_SIGNAL_SYMBOL, tick_lifetime)
+
+    def is_free(self, position: int, signal_symbol: str) -> bool:
+        return self._symbols[position] == self.DEFAULT_SIGNAL_SYMBOL or self._symbols[position] == signal_symbol
+
+    def is_collision(self, position: int, signal_symbol: str) -> bool:
+        return not self.is_free(position, signal_symbol)
+
+    def is_jammed(self, position: int) -> bool:
+        return self._symbols[position] == self.JAM_SIGNAL_SYMBOL
+
+
+class EventSimulation:
+    def __init__(self, wire: EventWire, devices: list[Device], probability: float, observer: SimulationObserver | None = None,
+                 traffic: list[TrafficSource] | None = None) -> None:
+        self._wire = wire
+        self._devices = devices
+        self._observer = observer
+        self._tick = 0
+        self._schedules = create_schedules(devices, traffic or [BernoulliTraffic(probability) for _ in devices])
+        self._last_ticks = [-1] * len(devices)
+        self._wakeups = [(wakeup, index) for index, device in enumerate(devices)
+                         for wakeup in (self._schedules[index].next_tick, device.ticks_to_next_change() - 1) if wakeup != math.inf]
+        heapq.heapify(self._wakeups)
+
+        self._devices_at: dict[int, list[int]] = {}
+        for index, device in enumerate(devices):
+            self._devices_at.setdefault(device.position_in_wire, []).append(index)
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick
+
+    def set_traffic(self, traffic: list[TrafficSource]) -> None:
+        self._schedules = create_schedules(self._devices, traffic)
+        for index, device in enumerate(self._devices):
+            for wakeup in (self._schedules[index].next_tick, self._tick - 1 + device.ticks_to_next_change()):
+                if wakeup != math.inf:
+                    heapq.heappush(self._wakeups, (wakeup, index))
+
+    def run(self, ticks: int) -> None:
+        end = self._tick + ticks
+        while True:
+            tick = min(self._wire.next_change_tick(), self._wakeups[0][0] if self._wakeups else math.inf)
+            if tick >= end:
+                break
+
+            for position in self._wire.advance_to(tick):
+                for index in self._devices_at[position]:
+                    heapq.heappush(self._wakeups, (tick, index))
+
+            if self._observer is not None:
+                self._observer.on_tick(tick)
+
+            woken = set()
+            while self._wakeups and self._wakeups[0][0] == tick:
+                woken.add(heapq.heappop(self._wakeups)[1])
+            for index in sorted(woken):
+                self._wake_device(index, tick)
+
+        for index, device in enumerate(self._devices):
+            device.skip_idle_ticks(end - self._last_ticks[index] - 1)
+            self._last_ticks[index] = end - 1
+        self._tick = end
+
+    def _wake_device(self, index: int, tick: int) -> None:
+        device = self._devices[index]
+        device.skip_idle_ticks(tick - self._last_ticks[index] - 1)
+        schedule = self._schedules[index]
+        if schedule.next_tick == tick:
+            device.queue_packets(schedule.pop(tick))
+            if schedule.next_tick != math.inf:
+                heapq.heappush(self._wakeups, (schedule.next_tick, index))
+        device.tick()
+        self._last_ticks[index] = tick
+
+        wakeup = tick + device.ticks_to_next_change()
+        if wakeup != math.inf:
+            heapq.heappush(self._wakeups, (wakeup, index))
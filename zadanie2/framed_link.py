@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import random
+import sys
+from collections import deque
+from typing import Iterable, Iterator
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "zadanie1"))
+
+from bitbuffer import FORMATS, BitBuffer, iter_bits
+from crc import CRC_POLYS
+from program import DEFAULT_FRAME_LENGTH, STREAM_CHUNK_BITS, FrameProcessor
+from stats import STATUS_OK, DecodeStats
+from tuning import inject_bit_errors
+
+from device import Device, TooManyAttemptsError
+from event_simulation import EventSimulation, EventWire
+from main import ENGINES, WIRE_BACKENDS, WIRE_LENGTH, create_wire
+from metrics import MetricsCollector, ObserverGroup, SimulationObserver, attach_observer
+from simulation import Simulation, device_positions, device_streams, device_symbol
+
+DEVICES = 3
+BATCH_FRAMES = 64
+STEP_TICKS = 10000
+MAX_TICKS = 10_000_000
+
+
+class FramedLink(SimulationObserver):
+    def __init__(self, processor: FrameProcessor, devices: list[Device], chunks: Iterable[BitBuffer], bit_error_rate: float = 0.0,
+                 rng: random.Random | None = None, batch_frames: int = BATCH_FRAMES) -> None:
+        self._processor = processor
+        self._devices = devices
+        self._data_chunks: Iterator[BitBuffer] = processor.split_data(chunks)
+        self._bit_error_rate = bit_error_rate
+        self._rng = rng if rng is not None else random.Random()
+        self._batch_frames = batch_frames
+        self._pending: dict[Device, deque[BitBuffer]] = {device: deque() for device in devices}
+        self._is_exhausted = False
+        self._tick = 0
+        self._end_tick: int | None = None
+
+        self._stats = DecodeStats()
+        self._payload_bits = 0
+        self._frame_bits = 0
+        self._delivered_bits = 0
+        self._undetected_errors = 0
+
+    @property
+    def stats(self) -> DecodeStats:
+        return self._stats
+
+    @property
+    def finished(self) -> bool:
+        return self._is_exhausted and not any(self._pending.values())
+
+    @property
+    def end_tick(self) -> int | None:
+        return self._end_tick
+
+    def start(self) -> None:
+        for device in self._devices:
+            self._queue_frames(device)
+
+    def _queue_frames(self, device: Device) -> None:
+        pending = self._pending[device]
+        while not self._is_exhausted and len(pending) < self._batch_frames:
+            data = next(self._data_chunks, None)
+            if data is None:
+                self._is_exhausted = True
+                return
+            frame = self._processor.create_frame(data)
+            self._payload_bits += len(data)
+            self._frame_bits += len(frame)
+            pending.append(data)
+            device.queue_frame(frame)
+
+    def on_tick(self, tick: int) -> None:
+        self._tick = tick
+
+    def on_packet_sent(self, device: Device, frame) -> None:
+        if frame is None:
+            return
+        data = self._pending[device].popleft()
+        received = inject_bit_errors(frame, self._bit_error_rate, self._rng) if self._bit_error_rate > 0 else frame
+        decoded, status = self._processor.extract_frame_data(received, self._stats)
+        self._stats.record(len(received), status, len(decoded) if decoded is not None else 0)
+        if status == STATUS_OK:
+            if decoded == data:
+                self._delivered_bits += len(data)
+            else:
+                self._undetected_errors += 1
+
+        if len(self._pending[device]) < self._batch_frames // 2:
+            self._queue_frames(device)
+        if self.finished:
+            self._end_tick = self._tick + 1
+
+    def summary(self, ticks: int) -> dict:
+        return {
+            "ticks": ticks,
+            "finished": self.finished,
+            "payload_bits": self._payload_bits,
+            "frame_bits": self._frame_bits,
+            "delivered_bits": self._delivered_bits,
+            "goodput": self._delivered_bits / ticks if ticks else 0.0,
+            "framing_efficiency": self._payload_bits / self._frame_bits if self._frame_bits else 0.0,
+            "undetected_errors": self._undetected_errors,
+            "decode": self._stats.to_dict(),
+        }
+
+    def report(self, ticks: int) -> str:
+        summary = self.summary(ticks)
+        counters = summary["decode"]["counters"]
+        lines = [
+            f"Payload: {summary['payload_bits']} bits in {summary['frame_bits']} frame bits "
+            f"(framing efficiency {summary['framing_efficiency']:.3f})",
+            f"Frames received: {counters['frames_found']}, valid: {counters['frames_valid']}, CRC errors: {counters['crc_errors']}, "
+            f"other errors: {self._stats.errors - counters['crc_errors']}, undetected errors: {summary['undetected_errors']}",
+            f"Delivered: {summary['delivered_bits']} bits in {ticks} ticks, goodput {summary['goodput']:.4f} bits/tick",
+        ]
+        if not summary["finished"]:
+            lines.append("Payload was not fully transmitted.")
+        return "\n".join(lines) + "\n"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Send zadanie1 frames through the CSMA/CD wire.")
+    parser.add_argument("payload", help="file with payload bits")
+    parser.add_argument("--input-format", choices=FORMATS, default="text")
+    parser.add_argument("--engine", choices=ENGINES, default="event")
+    parser.add_argument("--wire", choices=WIRE_BACKENDS, default="list", help="wire backend of the tick engine")
+    parser.add_argument("--wire-length", type=int, default=WIRE_LENGTH)
+    parser.add_argument("--devices", type=int, default=DEVICES)
+    parser.add_argument("--frame-length", type=int, default=DEFAULT_FRAME_LENGTH)
+    parser.add_argument("--crc-poly", default="crc8", help=f"polynomial bits or one of: {', '.join(CRC_POLYS)}")
+    parser.add_argument("--ber", type=float, default=0.0, help="bit error rate of frames in flight")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--bulk-random", action="store_true", help="pre-draw random numbers in NumPy chunks")
+    parser.add_argument("--batch-frames", type=int, default=BATCH_FRAMES, help="frames queued per device at a time")
+    parser.add_argument("--chunk-bits", type=int, default=STREAM_CHUNK_BITS)
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    processor = FrameProcessor(frame_length=args.frame_length, crc_poly=args.crc_poly)
+    positions = device_positions(args.devices, args.wire_length)
+    rngs = device_streams(args.seed, args.devices + 1, args.bulk_random)
+
+    if args.engine == "event":
+        wire = EventWire(args.wire_length, positions)
+    else:
+        wire = create_wire(args.wire, args.wire_length)
+    devices = [Device(device_symbol(index), wire, position, rngs[index]) for index, position in enumerate(positions)]
+
+    metrics = MetricsCollector(devices)
+    link = FramedLink(processor, devices, iter_bits(args.payload, args.input_format, args.chunk_bits), args.ber, rngs[-1],
+                      args.batch_frames)
+    observer = ObserverGroup(metrics, link)
+    attach_observer(observer, devices, wire)
+    link.start()
+
+    if args.engine == "event":
+        simulation = EventSimulation(wire, devices, 0, observer)
+    else:
+        simulation = Simulation(wire, devices, 0, observer)
+
+    try:
+        while not link.finished and simulation.tick_count < args.max_ticks:
+            simulation.run(min(STEP_TICKS, args.max_ticks - simulation.tick_count))
+    except TooManyAttemptsError as error:
+        print(f"Simulation stopped: {error}")
+
+    ticks = link.end_tick if link.finished else simulation.tick_count
+    metrics.finish(ticks)
+    sys.stdout.write(link.report(ticks))
+    sys.stdout.write(metrics.report())
+    if args.json:
+        with open(args.json, "w") as output_file:
+            json.dump({"link": link.summary(ticks), "metrics": metrics.summary()}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
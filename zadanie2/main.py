@@ -1,40 +1,185 @@
-import random
+import argparse
+import os
 
+from checkpoint import CheckpointWriter, load_checkpoint
 from device import Device
+from event_simulation import EventSimulation, EventWire
+from metrics import MetricsCollector, attach_observer
+from simulation import Simulation, device_streams
+from topology import load_topology
+from traffic import TRAFFIC_MODELS, TrafficSource, create_traffic, load_arrival_trace
 from wire import Wire
+from wire_trace import TraceWriter
 
 WIRE_LENGTH = 40
 TRANSMITTION_PROBABILITY = 0.005
 TICKS = 2000
 
+DEVICES = (("A", 10), ("B", 20), ("C", 30))
+
 OUTPUT_FILENAME = "./output.txt"
 
+WIRE_BACKENDS = ("list", "slotted", "numpy")
+ENGINES = ("tick", "event")
 
-def main() -> None:
-    wire = Wire(WIRE_LENGTH)
-    devices = [
-        Device("A", wire, 10),
-        Device("B", wire, 20),
-        Device("C", wire, 30)
-    ]
-
-    output_file = open(OUTPUT_FILENAME, "w")
-
-    for _ in range(TICKS):
-        for device in devices:
-            if random.random() < TRANSMITTION_PROBABILITY:
-                device.send_packet()
-            device.tick()
-        wire.tick()
-        output_file.write(f"{wire}\n")
-
-    for device in devices:
-        output_file.write(
-            f"Device {device._symbol}: {device.successfull_transmissions} successfull transmissions, {device.failed_transmissions} failed transmissions.\n"
-        )
+SNAPSHOT_OPTIONS = ("engine", "wire", "wire_length", "topology", "bulk_random")
+FORK_OPTIONS = ("seed", "traffic", "probability", "mean_on", "mean_off", "arrival_trace")
+
+
+def create_wire(backend: str, length: int) -> Wire:
+    if backend == "numpy":
+        from numpy_wire import NumpyWire
+
+        return NumpyWire(length)
+    if backend == "slotted":
+        from slotted_wire import SlottedWire
+
+        return SlottedWire(length)
+    return Wire(length)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CSMA/CD simulation.")
+    parser.add_argument("--engine", choices=ENGINES, default="tick", help="tick-by-tick or discrete-event simulation")
+    parser.add_argument("--wire", choices=WIRE_BACKENDS, default="list", help="wire backend of the tick engine")
+    parser.add_argument("--wire-length", type=int, default=WIRE_LENGTH)
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--probability", type=float, default=TRANSMITTION_PROBABILITY,
+                        help="arrival probability per tick (Poisson: rate per tick, on/off: probability while on)")
+    parser.add_argument("--traffic", choices=TRAFFIC_MODELS, default="bernoulli")
+    parser.add_argument("--mean-on", type=float, default=100, help="mean on period of on/off traffic in ticks")
+    parser.add_argument("--mean-off", type=float, default=900, help="mean off period of on/off traffic in ticks")
+    parser.add_argument("--arrival-trace", help="text file with '<device symbol> <tick>' lines replayed by trace traffic")
+    parser.add_argument("--topology", help="JSON or YAML topology file with segments, hubs/repeaters and devices")
+    parser.add_argument("--seed", type=int, help="master seed of the independent per-device random streams")
+    parser.add_argument("--bulk-random", action="store_true", help="pre-draw random numbers in NumPy chunks")
+    parser.add_argument("--output", default=OUTPUT_FILENAME)
+    parser.add_argument("--trace", help="write the wire state as a binary trace instead of text lines in the output file")
+    parser.add_argument("--metrics-json", help="write utilisation, delay, backoff and fairness metrics as JSON")
+    parser.add_argument("--checkpoint", help="write snapshots of the whole simulation state to this file")
+    parser.add_argument("--checkpoint-every", type=int, default=0, help="ticks between snapshots (0: only at the end)")
+    parser.add_argument("--resume", help="continue from a snapshot for another --ticks ticks")
+    parser.add_argument("--fork", type=int, default=0,
+                        help="run this many what-if branches from the --resume snapshot, each reseeded from --seed and "
+                             "with the traffic options given on the command line")
+    args = parser.parse_args()
+
+    if args.fork and not args.resume:
+        parser.error("--fork needs a snapshot given with --resume")
+    if args.fork and args.seed is None:
+        parser.error("--fork needs --seed to reseed the branches")
+    if args.trace and args.engine == "event":
+        parser.error("--trace needs the tick engine, the event engine does not keep the state of the whole wire")
+    if args.resume:
+        fixed = SNAPSHOT_OPTIONS if args.fork else SNAPSHOT_OPTIONS + FORK_OPTIONS
+        changed = [name for name in fixed if getattr(args, name) != parser.get_default(name)]
+        if changed:
+            options = ", ".join(f"--{name.replace('_', '-')}" for name in changed)
+            parser.error(f"{options} cannot be changed when resuming, the snapshot keeps its own configuration"
+                         + ("" if args.fork else " (traffic options and --seed apply only to --fork branches)"))
+    return args
+
+
+def create_device_traffic(args: argparse.Namespace, devices: list[Device], start_tick: int = 0) -> list[TrafficSource]:
+    trace = load_arrival_trace(args.arrival_trace) if args.arrival_trace else None
+    return create_traffic(args.traffic, [device.symbol for device in devices], args.probability, args.mean_on, args.mean_off, trace,
+                          start_tick)
+
+
+def create_state(args: argparse.Namespace) -> dict:
+    topology = load_topology(args.topology) if args.topology else None
+    rngs = device_streams(args.seed, len(topology.devices) if topology else len(DEVICES), args.bulk_random)
+
+    if topology:
+        wire = topology.create_event_wire() if args.engine == "event" else topology.create_wire()
+        devices = topology.create_devices(wire, rngs)
+    else:
+        wire = EventWire(args.wire_length, [position for _, position in DEVICES]) if args.engine == "event" else create_wire(args.wire, args.wire_length)
+        devices = [Device(symbol, wire, position, rng) for (symbol, position), rng in zip(DEVICES, rngs)]
+    metrics = MetricsCollector(devices)
+    attach_observer(metrics, devices, wire)
 
+    if args.engine == "event":
+        simulation = EventSimulation(wire, devices, args.probability, metrics, create_device_traffic(args, devices))
+    else:
+        simulation = Simulation(wire, devices, args.probability, metrics, create_device_traffic(args, devices))
+    return {"engine": args.engine, "wire": wire, "devices": devices, "metrics": metrics, "simulation": simulation}
+
+
+def fork_state(args: argparse.Namespace, state: dict, tick: int, branch: int) -> None:
+    for index, device in enumerate(state["devices"]):
+        device.rng.seed(f"{args.seed}:{branch}:{index}")
+    state["simulation"].set_traffic(create_device_traffic(args, state["devices"], tick))
+
+
+def branch_path(path: str | None, branch: int | None) -> str | None:
+    if path is None or branch is None:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.{branch}{extension}"
+
+
+def run_state(args: argparse.Namespace, state: dict, branch: int | None = None) -> None:
+    wire, metrics, simulation = state["wire"], state["metrics"], state["simulation"]
+    end = simulation.tick_count + args.ticks
+    checkpoint_path = branch_path(args.checkpoint, branch)
+    checkpoint_writer = CheckpointWriter(checkpoint_path, args.checkpoint_every) if checkpoint_path else None
+    output_file = open(branch_path(args.output, branch), "w")
+
+    if state["engine"] == "event":
+        while simulation.tick_count < end:
+            ticks = end - simulation.tick_count
+            if checkpoint_writer and checkpoint_writer.interval > 0:
+                ticks = min(ticks, checkpoint_writer.interval - simulation.tick_count % checkpoint_writer.interval)
+            simulation.run(ticks)
+            if checkpoint_writer and checkpoint_writer.is_due(simulation.tick_count):
+                checkpoint_writer.write(simulation.tick_count, state)
+    else:
+        trace_path = branch_path(args.trace, branch)
+        trace_writer = TraceWriter(trace_path, len(str(wire))) if trace_path else None
+        while simulation.tick_count < end:
+            simulation.tick()
+            if trace_writer:
+                trace_writer.write(str(wire))
+            else:
+                output_file.write(f"{wire}\n")
+            if checkpoint_writer and checkpoint_writer.is_due(simulation.tick_count):
+                checkpoint_writer.write(simulation.tick_count, state)
+        if trace_writer:
+            trace_writer.close()
+
+    if checkpoint_writer:
+        if not checkpoint_writer.is_due(simulation.tick_count):
+            checkpoint_writer.write(simulation.tick_count, state)
+        checkpoint_writer.close()
+
+    metrics.finish(simulation.tick_count)
+    output_file.write(metrics.report())
+    if args.metrics_json:
+        metrics.save_json(branch_path(args.metrics_json, branch))
     output_file.close()
 
 
+def load_resumed_state(args: argparse.Namespace) -> tuple[int, dict]:
+    tick, state = load_checkpoint(args.resume)
+    if args.trace and state["engine"] == "event":
+        raise Exception("--trace needs the tick engine, the snapshot was taken by the event engine.")
+    return tick, state
+
+
+def main() -> None:
+    args = parse_args()
+    if args.fork:
+        for branch in range(args.fork):
+            tick, state = load_resumed_state(args)
+            fork_state(args, state, tick, branch)
+            run_state(args, state, branch)
+    elif args.resume:
+        _, state = load_resumed_state(args)
+        run_state(args, state)
+    else:
+        run_state(args, create_state(args))
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,170 @@
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from device import Device, TooManyAttemptsError
+from main import WIRE_BACKENDS, create_wire
+from metrics import SimulationObserver, attach_observer
+from simulation import Simulation, device_positions, device_streams, device_symbol
+
+WIRE_LENGTH = 100
+DEVICES = 10
+TRANSMITTION_PROBABILITY = 0.001
+TRANSMISSIONS = 50
+TICKS = 100000
+
+
+class TransmissionCounter(SimulationObserver):
+    def __init__(self) -> None:
+        self._started = 0
+
+    @property
+    def started(self) -> int:
+        return self._started
+
+    def on_state_change(self, device: Device, old_state: Device.State, new_state: Device.State) -> None:
+        if new_state == Device.State.TRANSMITTING:
+            self._started += 1
+
+
+def build_simulation(backend: str, wire_length: int, devices: int, probability: float, seed: int) -> tuple[Simulation, TransmissionCounter]:
+    wire = create_wire(backend, wire_length)
+    rngs = device_streams(seed, devices)
+    stations = [Device(device_symbol(index), wire, position, rngs[index])
+                for index, position in enumerate(device_positions(devices, wire_length))]
+    counter = TransmissionCounter()
+    attach_observer(counter, stations)
+    return Simulation(wire, stations, probability), counter
+
+
+def run_ticks(simulation: Simulation, ticks: int) -> bool:
+    try:
+        simulation.run(ticks)
+    except TooManyAttemptsError:
+        return False
+    return True
+
+
+def run_transmissions(simulation: Simulation, counter: TransmissionCounter, transmissions: int, max_ticks: int) -> bool:
+    target = counter.started + transmissions
+    end = simulation.tick_count + max_ticks
+    try:
+        while counter.started < target and simulation.tick_count < end:
+            simulation.tick()
+    except TooManyAttemptsError:
+        return False
+    return True
+
+
+def warmed_up(backend: str, wire_length: int, devices: int, probability: float, warmup_transmissions: int, warmup_ticks: int | None,
+              max_ticks: int, seed: int) -> tuple[Simulation, TransmissionCounter] | None:
+    simulation, counter = build_simulation(backend, wire_length, devices, probability, seed)
+    if warmup_ticks is not None:
+        completed = run_ticks(simulation, warmup_ticks)
+    else:
+        completed = run_transmissions(simulation, counter, warmup_transmissions, max_ticks)
+    return (simulation, counter) if completed else None
+
+
+def per_transmission(value: int | None, transmissions: int) -> float | None:
+    return value / transmissions if value is not None and transmissions else None
+
+
+def count_signal_allocations(wire) -> list[int] | None:
+    if not hasattr(wire, "Signal"):
+        return None
+    counter = [0]
+    signal_class = wire.Signal
+
+    def create_signal(*args, **kwargs):
+        counter[0] += 1
+        return signal_class(*args, **kwargs)
+
+    wire.Signal = create_signal
+    return counter
+
+
+def measure(backend: str, wire_length: int, devices: int, probability: float, transmissions: int, ticks: int,
+            warmup_ticks: int | None, seed: int) -> dict:
+    result = {"backend": backend, "seconds": None, "ticks": 0, "ticks_per_second": None, "transmissions": 0, "completed": False,
+              "signal_allocations": None, "traced_current_bytes": None, "traced_peak_bytes": None, "net_new_blocks": None}
+    built = warmed_up(backend, wire_length, devices, probability, transmissions, warmup_ticks, ticks, seed)
+    if built is None:
+        return result
+    simulation, counter = built
+    gc.collect()
+    start_tick, started = simulation.tick_count, counter.started
+    start = time.perf_counter()
+    completed = run_transmissions(simulation, counter, transmissions, ticks)
+    seconds = time.perf_counter() - start
+    ticks_run = simulation.tick_count - start_tick
+    result.update(seconds=seconds, ticks=ticks_run, ticks_per_second=ticks_run / seconds if ticks_run and seconds > 0 else None,
+                  transmissions=counter.started - started, completed=completed)
+
+    simulation, counter = warmed_up(backend, wire_length, devices, probability, transmissions, warmup_ticks, ticks, seed)
+    signal_allocations = count_signal_allocations(simulation.wire)
+    gc.collect()
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    run_transmissions(simulation, counter, transmissions, ticks)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated_blocks = sum(max(stat.count_diff, 0) for stat in snapshot_after.compare_to(snapshot_before, "lineno"))
+
+    result.update(
+        signal_allocations=signal_allocations[0] if signal_allocations is not None else None,
+        traced_current_bytes=current,
+        traced_peak_bytes=peak,
+        net_new_blocks=allocated_blocks,
+    )
+    result["signals_per_transmission"] = per_transmission(result["signal_allocations"], result["transmissions"])
+    result["blocks_per_transmission"] = per_transmission(allocated_blocks, result["transmissions"])
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Memory and allocation benchmark of the wire backends.")
+    parser.add_argument("--backends", choices=WIRE_BACKENDS, nargs="+", default=["list", "slotted"])
+    parser.add_argument("--wire-length", type=int, default=WIRE_LENGTH)
+    parser.add_argument("--devices", type=int, default=DEVICES)
+    parser.add_argument("--probability", type=float, default=TRANSMITTION_PROBABILITY)
+    parser.add_argument("--transmissions", type=int, default=TRANSMISSIONS,
+                        help="measure until this many transmissions have started, so the window always creates new signals")
+    parser.add_argument("--ticks", type=int, default=TICKS, help="upper limit of the measured window in ticks")
+    parser.add_argument("--warmup-ticks", type=int,
+                        help="ticks run before measuring (default: until --transmissions transmissions have started)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file with the results")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results = []
+    print(f"{'backend':<8} {'ticks':>7} {'ticks/s':>10} {'started':>8} {'signals/tx':>11} {'blocks/tx':>10} {'peak KiB':>10} "
+          f"{'retained KiB':>13} {'completed':>9}")
+    for backend in args.backends:
+        result = measure(backend, args.wire_length, args.devices, args.probability, args.transmissions, args.ticks, args.warmup_ticks,
+                         args.seed)
+        results.append(result)
+        if result["seconds"] is None:
+            print(f"{backend:<8} aborted during warmup")
+            continue
+        speed = f"{result['ticks_per_second']:.1f}" if result["ticks_per_second"] else "-"
+        signals = f"{result['signals_per_transmission']:.1f}" if result["signals_per_transmission"] is not None else "-"
+        blocks = f"{result['blocks_per_transmission']:.1f}" if result["blocks_per_transmission"] is not None else "-"
+        print(
+            f"{backend:<8} {result['ticks']:>7} {speed:>10} {result['transmissions']:>8} {signals:>11} {blocks:>10} "
+            f"{result['traced_peak_bytes'] / 1024:>10.1f} {result['traced_current_bytes'] / 1024:>13.1f} {str(result['completed']):>9}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"meta": vars(args), "results": results}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
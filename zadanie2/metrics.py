@@ -0,0 +1,256 @@
+import json
+import math
+from collections import Counter, deque
+from dataclasses import dataclass, field
+
+from device import Device
+from wire import Wire
+
+
+class SimulationObserver:
+    def on_tick(self, tick: int) -> None:
+        pass
+
+    def on_state_change(self, device: Device, old_state: Device.State, new_state: Device.State) -> None:
+        pass
+
+    def on_backoff(self, device: Device, failed_attempts: int, backoff_ticks: int) -> None:
+        pass
+
+    def on_packets_queued(self, device: Device, count: int) -> None:
+        pass
+
+    def on_packet_dequeued(self, device: Device) -> None:
+        pass
+
+    def on_packet_sent(self, device: Device, frame) -> None:
+        pass
+
+    def on_wire_tick(self, busy: bool) -> None:
+        pass
+
+
+class ObserverGroup(SimulationObserver):
+    def __init__(self, *observers: SimulationObserver) -> None:
+        self._observers = observers
+
+    def on_tick(self, tick: int) -> None:
+        for observer in self._observers:
+            observer.on_tick(tick)
+
+    def on_state_change(self, device: Device, old_state: Device.State, new_state: Device.State) -> None:
+        for observer in self._observers:
+            observer.on_state_change(device, old_state, new_state)
+
+    def on_backoff(self, device: Device, failed_attempts: int, backoff_ticks: int) -> None:
+        for observer in self._observers:
+            observer.on_backoff(device, failed_attempts, backoff_ticks)
+
+    def on_packets_queued(self, device: Device, count: int) -> None:
+        for observer in self._observers:
+            observer.on_packets_queued(device, count)
+
+    def on_packet_dequeued(self, device: Device) -> None:
+        for observer in self._observers:
+            observer.on_packet_dequeued(device)
+
+    def on_packet_sent(self, device: Device, frame) -> None:
+        for observer in self._observers:
+            observer.on_packet_sent(device, frame)
+
+    def on_wire_tick(self, busy: bool) -> None:
+        for observer in self._observers:
+            observer.on_wire_tick(busy)
+
+
+def attach_observer(observer: SimulationObserver, devices: list[Device], wire: Wire | None = None) -> None:
+    for device in devices:
+        device.observer = observer
+    if wire is not None and hasattr(wire, "observer"):
+        wire.observer = observer
+
+
+@dataclass
+class RunningStats:
+    count: int = 0
+    mean: float = 0.0
+    _m2: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_dict(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count, "mean": self.mean, "stdev": self.stdev, "min": self.minimum, "max": self.maximum}
+
+
+@dataclass
+class DeviceMetrics:
+    symbol: str
+    min_packet_time: int
+    state: Device.State = Device.State.RECEIVING
+    last_change_tick: int = 0
+    state_ticks: Counter = field(default_factory=Counter)
+    frame_start_tick: int | None = None
+    first_collision_tick: int | None = None
+    access_delay: RunningStats = field(default_factory=RunningStats)
+    collision_resolution: RunningStats = field(default_factory=RunningStats)
+    arrival_ticks: deque = field(default_factory=deque)
+    queueing_delay: RunningStats = field(default_factory=RunningStats)
+
+
+def jain_index(values: list[float]) -> float | None:
+    square_sum = sum(value * value for value in values)
+    if not square_sum:
+        return None
+    return sum(values) ** 2 / (len(values) * square_sum)
+
+
+class MetricsCollector(SimulationObserver):
+    def __init__(self, devices: list[Device]) -> None:
+        self._devices = devices
+        self._metrics = {device: DeviceMetrics(device.symbol, device.min_packet_time, device.state) for device in devices}
+        self._tick = 0
+        self._end_tick: int | None = None
+        self._wire_ticks = 0
+        self._busy_wire_ticks = 0
+        self._backoff_slots: Counter = Counter()
+        self._successful_ticks = 0
+
+    def on_tick(self, tick: int) -> None:
+        self._tick = tick
+
+    def on_state_change(self, device: Device, old_state: Device.State, new_state: Device.State) -> None:
+        metrics = self._metrics[device]
+        metrics.state_ticks[old_state] += self._tick - metrics.last_change_tick
+        metrics.last_change_tick = self._tick
+        metrics.state = new_state
+
+        if old_state == Device.State.RECEIVING:
+            metrics.frame_start_tick = self._tick
+        elif old_state == Device.State.TRANSMITTING and new_state == Device.State.RECEIVING:
+            if metrics.frame_start_tick is not None:
+                metrics.access_delay.add(self._tick - metrics.frame_start_tick)
+            if metrics.first_collision_tick is not None:
+                metrics.collision_resolution.add(self._tick - metrics.first_collision_tick)
+            metrics.frame_start_tick = None
+            metrics.first_collision_tick = None
+        elif old_state == Device.State.TRANSMITTING and metrics.first_collision_tick is None:
+            metrics.first_collision_tick = self._tick
+
+    def on_backoff(self, device: Device, failed_attempts: int, backoff_ticks: int) -> None:
+        self._backoff_slots[(failed_attempts, backoff_ticks // device.min_packet_time)] += 1
+
+    def on_packets_queued(self, device: Device, count: int) -> None:
+        self._metrics[device].arrival_ticks.extend([self._tick] * count)
+
+    def on_packet_dequeued(self, device: Device) -> None:
+        metrics = self._metrics[device]
+        if metrics.arrival_ticks:
+            metrics.queueing_delay.add(self._tick - metrics.arrival_ticks.popleft())
+
+    def on_packet_sent(self, device: Device, frame) -> None:
+        self._successful_ticks += device.packet_time
+
+    def on_wire_tick(self, busy: bool) -> None:
+        self._wire_ticks += 1
+        self._busy_wire_ticks += busy
+
+    def finish(self, tick: int) -> None:
+        self._end_tick = tick
+        for metrics in self._metrics.values():
+            metrics.state_ticks[metrics.state] += tick - metrics.last_change_tick
+            metrics.last_change_tick = tick
+
+    def summary(self) -> dict:
+        ticks = self._end_tick if self._end_tick is not None else self._tick
+        access_delay = RunningStats()
+        collision_resolution = RunningStats()
+        queueing_delay = RunningStats()
+        devices = []
+        for device in self._devices:
+            metrics = self._metrics[device]
+            access_delay.merge(metrics.access_delay)
+            collision_resolution.merge(metrics.collision_resolution)
+            queueing_delay.merge(metrics.queueing_delay)
+            devices.append({
+                "symbol": device.symbol,
+                "successfull_transmissions": device.successfull_transmissions,
+                "failed_transmissions": device.failed_transmissions,
+                "access_delay": metrics.access_delay.to_dict(),
+                "collision_resolution": metrics.collision_resolution.to_dict(),
+                "queueing_delay": metrics.queueing_delay.to_dict(),
+                "queued_packets": device.queued_packets,
+                "jam_share": metrics.state_ticks[Device.State.JAMMING] / ticks if ticks else 0.0,
+                "state_ticks": {state.name: metrics.state_ticks[state] for state in Device.State},
+            })
+
+        backoff: dict[int, Counter] = {}
+        for (attempt, slots), count in sorted(self._backoff_slots.items()):
+            backoff.setdefault(attempt, Counter())[slots] = count
+
+        return {
+            "ticks": ticks,
+            "utilisation": self._successful_ticks / ticks if ticks else 0.0,
+            "busy_share": self._busy_wire_ticks / self._wire_ticks if self._wire_ticks else None,
+            "access_delay": access_delay.to_dict(),
+            "collision_resolution": collision_resolution.to_dict(),
+            "queueing_delay": queueing_delay.to_dict(),
+            "queued_packets": sum(device.queued_packets for device in self._devices),
+            "jam_share": sum(device["jam_share"] for device in devices) / len(devices) if devices else 0.0,
+            "jain_index": jain_index([device.successfull_transmissions for device in self._devices]),
+            "backoff_slots": {str(attempt): {str(slots): count for slots, count in counts.items()} for attempt, counts in backoff.items()},
+            "devices": devices,
+        }
+
+    def report(self) -> str:
+        summary = self.summary()
+        lines = [
+            f"Device {device['symbol']}: {device['successfull_transmissions']} successfull transmissions, {device['failed_transmissions']} failed transmissions."
+            for device in summary["devices"]
+        ]
+        lines.append(f"Ticks: {summary['ticks']}")
+        lines.append(f"Channel utilisation: {summary['utilisation']:.3f}")
+        if summary["busy_share"] is not None:
+            lines.append(f"Wire busy share: {summary['busy_share']:.3f}")
+        lines.append(f"Jam time share: {summary['jam_share']:.3f}")
+        if summary["jain_index"] is not None:
+            lines.append(f"Jain's fairness index: {summary['jain_index']:.3f}")
+        lines.append(f"Queued packets left: {summary['queued_packets']}")
+        for name in ("queueing_delay", "access_delay", "collision_resolution"):
+            stats = summary[name]
+            label = name.replace("_", " ").capitalize()
+            if stats["count"]:
+                lines.append(f"{label}: mean {stats['mean']:.1f}, min {stats['min']}, max {stats['max']} ticks ({stats['count']} frames)")
+        for attempt, counts in summary["backoff_slots"].items():
+            total = sum(counts.values())
+            mean = sum(int(slots) * count for slots, count in counts.items()) / total
+            lines.append(f"Backoff after {attempt} failed attempts: {total} times, mean {mean:.1f} slots")
+        return "\n".join(lines) + "\n"
+
+    def save_json(self, path: str) -> None:
+        with open(path, "w") as output_file:
+            json.dump(self.summary(), output_file, indent=2)
@@ -0,0 +1,116 @@
+import numpy as np
+
+from wire import Wire
+
+
+class NumpyWire:
+    DEFAULT_SIGNAL_SYMBOL = Wire.DEFAULT_SIGNAL_SYMBOL
+    OVERLAPPING_SIGNAL_SYMBOL = Wire.OVERLAPPING_SIGNAL_SYMBOL
+    JAM_SIGNAL_SYMBOL = Wire.JAM_SIGNAL_SYMBOL
+
+    _DEFAULT_ID = 0
+    _OVERLAPPING_ID = 1
+    _JAM_ID = 2
+
+    _COUNT = 0
+    _JAM_COUNT = 1
+    _SYMBOL_ID_SUM = 2
+
+    def __init__(self, length: int) -> None:
+        self._length = length
+        self._tick = 0
+
+        self._occupancy = np.zeros((3, length), dtype=np.int64)
+        self._right_edges = np.zeros((3, length), dtype=np.int64)
+        self._left_edges = np.zeros((3, length), dtype=np.int64)
+
+        self._pending_signals: list[tuple[int, np.ndarray, int]] = []
+        self._expiring_signals: dict[int, list[tuple[int, np.ndarray]]] = {}
+
+        self._symbol_table = [self.DEFAULT_SIGNAL_SYMBOL, self.OVERLAPPING_SIGNAL_SYMBOL, self.JAM_SIGNAL_SYMBOL]
+        self._symbol_ids = {symbol: index for index, symbol in enumerate(self._symbol_table)}
+        self._symbol_bytes = self._build_symbol_bytes()
+        self._codes = np.zeros(length, dtype=np.int64)
+        self.observer = None
+
+    @property
+    def length(self) -> int:
+        return self._length
+
+    def is_position_valid(self, position: int) -> bool:
+        return 0 <= position <= self.length - 1
+
+    def tick(self) -> None:
+        self._spread_signals()
+
+        for position, value, tick_lifetime in self._pending_signals:
+            self._add_edge(position, value)
+            self._expiring_signals.setdefault(self._tick + tick_lifetime, []).append((position, -value))
+        self._pending_signals.clear()
+
+        for position, value in self._expiring_signals.pop(self._tick, ()):
+            self._add_edge(position, value)
+
+        self._update_segment_symbols()
+        self._tick += 1
+
+        if self.observer is not None:
+            self.observer.on_wire_tick(bool(self._codes.any()))
+
+    def _spread_signals(self) -> None:
+        self._right_edges[:, 1:] = self._right_edges[:, :-1]
+        self._right_edges[:, 0] = 0
+        self._left_edges[:, :-1] = self._left_edges[:, 1:]
+        self._left_edges[:, -1] = 0
+
+        self._occupancy += self._right_edges
+        self._occupancy += self._left_edges
+
+    def _add_edge(self, position: int, value: np.ndarray) -> None:
+        self._occupancy[:, position] += value
+        self._right_edges[:, position] += value
+        self._left_edges[:, position] += value
+
+    def _update_segment_symbols(self) -> None:
+        count = self._occupancy[self._COUNT]
+        overlapping = np.where(self._occupancy[self._JAM_COUNT] > 0, self._JAM_ID, self._OVERLAPPING_ID)
+        self._codes = np.where(count == 1, self._occupancy[self._SYMBOL_ID_SUM], overlapping)
+        self._codes[count == 0] = self._DEFAULT_ID
+
+    def _symbol_id(self, symbol: str) -> int:
+        if symbol not in self._symbol_ids:
+            self._symbol_ids[symbol] = len(self._symbol_table)
+            self._symbol_table.append(symbol)
+            self._symbol_bytes = self._build_symbol_bytes()
+        return self._symbol_ids[symbol]
+
+    def _build_symbol_bytes(self) -> np.ndarray | None:
+        if all(len(symbol) == 1 and symbol.isascii() for symbol in self._symbol_table):
+            return np.frombuffer("".join(self._symbol_table).encode("ascii"), dtype=np.uint8)
+        return None
+
+    def send_signal(self, device_position: int, signal_symbol: str, tick_lifetime: int) -> None:
+        is_jam = int(signal_symbol == self.JAM_SIGNAL_SYMBOL)
+        value = np.array([1, is_jam, self._symbol_id(signal_symbol)], dtype=np.int64)
+        self._pending_signals.append((device_position, value, tick_lifetime))
+
+    def send_jam_signal(self, device_position: int, tick_lifetime: int) -> None:
+        self.send_signal(device_position, self.JAM_SIGNAL_SYMBOL, tick_lifetime)
+
+    def symbol_at(self, position: int) -> str:
+        return self._symbol_table[self._codes[position]]
+
+    def is_free(self, position: int, signal_symbol: str) -> bool:
+        code = self._codes[position]
+        return code == self._DEFAULT_ID or self._symbol_table[code] == signal_symbol
+
+    def is_collision(self, position: int, signal_symbol: str) -> bool:
+        return not self.is_free(position, signal_symbol)
+
+    def is_jammed(self, position: int) -> bool:
+        return self._codes[position] == self._JAM_ID
+
+    def __str__(self) -> str:
+        if self._symbol_bytes is not None:
+            return self._symbol_bytes[self._codes].tobytes().decode("ascii")
+        return "".join(self._symbol_table[code] for code in self._codes)
@@ -1,32 +1,164 @@
+import mmap
+import re
+from array import array
+
 from textual.app import App, ComposeResult
-from textual.widgets import Static
+from textual.widgets import Input, Static
 from textual.reactive import reactive
 
+from wire_trace import MAGIC, TraceReader
+
+PAGE_LINES = 100
+SEARCH_PATTERN = re.compile(rb"[#!]")
+INDEX_CHUNK = 1 << 20
+
+
+class TextTrace:
+    def __init__(self, filename):
+        self._file = open(filename, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size() else b""
+        self._offsets = array('Q', [0] if self._data else [])
+        self._indexed = 0
+
+    def _size(self):
+        self._file.seek(0, 2)
+        return self._file.tell()
+
+    @property
+    def line_count(self):
+        self._index_until()
+        return len(self._offsets)
+
+    def _index_until(self, line=None, position=None):
+        while self._indexed < len(self._data):
+            if line is not None and line < len(self._offsets):
+                return
+            if position is not None and position < self._indexed:
+                return
+            end = min(self._indexed + INDEX_CHUNK, len(self._data))
+            newline = self._data.find(b"\n", self._indexed, end)
+            while newline != -1:
+                if newline + 1 < len(self._data):
+                    self._offsets.append(newline + 1)
+                newline = self._data.find(b"\n", newline + 1, end)
+            self._indexed = end
+
+    def line(self, number):
+        self._index_until(line=number)
+        if not 0 <= number < len(self._offsets):
+            return None
+        start = self._offsets[number]
+        end = self._data.find(b"\n", start)
+        return self._data[start:end if end != -1 else len(self._data)].decode()
+
+    def find_next(self, number):
+        self._index_until(line=number + 1)
+        if number + 1 >= len(self._offsets):
+            return None
+        match = SEARCH_PATTERN.search(self._data, self._offsets[number + 1])
+        if match is None:
+            return None
+        self._index_until(position=match.start())
+        low, high = number + 1, len(self._offsets) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._offsets[middle] <= match.start():
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+
+class BinaryTrace:
+    def __init__(self, filename):
+        self._reader = TraceReader(filename)
+
+    @property
+    def line_count(self):
+        return len(self._reader)
+
+    def line(self, number):
+        return self._reader[number] if 0 <= number < len(self._reader) else None
+
+    def find_next(self, number):
+        for tick in range(number + 1, len(self._reader)):
+            row = self._reader[tick]
+            if "#" in row or "!" in row:
+                return tick
+        return None
+
+
+def open_trace(filename):
+    with open(filename, 'rb') as f:
+        is_binary = f.read(len(MAGIC)) == MAGIC
+    return BinaryTrace(filename) if is_binary else TextTrace(filename)
+
+
 class LineViewer(App):
     CSS_PATH = None
+    AUTO_FOCUS = None
     current_line = reactive(0)
 
     def __init__(self, filename, **kwargs):
         super().__init__(**kwargs)
-        with open(filename, 'r') as f:
-            self.lines = [line.rstrip('\n') for line in f]
+        self.trace = open_trace(filename)
 
     def compose(self) -> ComposeResult:
-        line_text = self.lines[0] if self.lines else "Brak danych."
-        display = f"{self.current_line+1}: {line_text}"
+        line_text = self.trace.line(0)
+        display = f"{self.current_line+1}: {line_text}" if line_text is not None else "Brak danych."
         yield Static(display, id="line")
+        yield Input(placeholder="Numer linii", id="jump", type="integer")
+
+    def on_mount(self):
+        self.query_one("#jump", Input).display = False
+
+    def show_line(self, number):
+        line_text = self.trace.line(number)
+        if line_text is None:
+            return
+        self.current_line = number
+        display = f"{self.current_line+1}: {line_text}"
+        self.query_one("#line", Static).update(display)
+
+    def show_line_or_last(self, number):
+        if self.trace.line(number) is None:
+            number = max(self.trace.line_count - 1, 0)
+        self.show_line(number)
+
+    def hide_jump(self):
+        jump = self.query_one("#jump", Input)
+        jump.display = False
+        self.set_focus(None)
 
     async def on_key(self, event):
+        jump = self.query_one("#jump", Input)
+        if jump.display:
+            if event.key == "escape":
+                self.hide_jump()
+            return
+
         if event.key == "space":
-            if self.current_line < len(self.lines) - 1:
-                self.current_line += 1
-                display = f"{self.current_line+1}: {self.lines[self.current_line]}"
-                self.query_one("#line", Static).update(display)
+            self.show_line(self.current_line + 1)
         elif event.key == "b":
             if self.current_line > 0:
-                self.current_line -= 1
-                display = f"{self.current_line+1}: {self.lines[self.current_line]}"
-                self.query_one("#line", Static).update(display)
+                self.show_line(self.current_line - 1)
+        elif event.key == "pagedown":
+            self.show_line_or_last(self.current_line + PAGE_LINES)
+        elif event.key == "pageup":
+            self.show_line(max(self.current_line - PAGE_LINES, 0))
+        elif event.key == "n":
+            found = self.trace.find_next(self.current_line)
+            if found is not None:
+                self.show_line(found)
+        elif event.key == "g":
+            jump.value = ""
+            jump.display = True
+            jump.focus()
+
+    def on_input_submitted(self, event):
+        self.hide_jump()
+        if event.value:
+            self.show_line_or_last(max(int(event.value) - 1, 0))
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,75 @@
+import random
+
+from device import Device
+from metrics import SimulationObserver
+from traffic import ArrivalSchedule, BernoulliTraffic, TrafficSource
+from wire import Wire
+
+
+def device_positions(devices: int, wire_length: int) -> list[int]:
+    return [(index + 1) * wire_length // (devices + 1) for index in range(devices)]
+
+
+def device_symbol(index: int) -> str:
+    if index < 26:
+        return chr(ord("A") + index)
+    if index < 52:
+        return chr(ord("a") + index - 26)
+    return chr(0x100 + index - 52)
+
+
+def device_streams(seed: int | str | None, count: int, bulk: bool = False) -> list[random.Random]:
+    if bulk:
+        import numpy as np
+
+        from bulk_random import BulkRandom
+
+        entropy = random.Random(seed).getrandbits(128) if isinstance(seed, str) else seed
+        return [BulkRandom(np.random.default_rng(child)) for child in np.random.SeedSequence(entropy).spawn(count)]
+    if seed is None:
+        return [random.Random() for _ in range(count)]
+    return [random.Random(f"{seed}:{index}") for index in range(count)]
+
+
+def create_schedules(devices: list[Device], traffic: list[TrafficSource]) -> list[ArrivalSchedule]:
+    schedules = []
+    for device, source in zip(devices, traffic):
+        device.saturate(source.saturated)
+        schedules.append(ArrivalSchedule(source, device.rng))
+    return schedules
+
+
+class Simulation:
+    def __init__(self, wire: Wire, devices: list[Device], probability: float, observer: SimulationObserver | None = None,
+                 traffic: list[TrafficSource] | None = None) -> None:
+        self._wire = wire
+        self._devices = devices
+        self._observer = observer
+        self._tick = 0
+        self._schedules = create_schedules(devices, traffic or [BernoulliTraffic(probability) for _ in devices])
+
+    @property
+    def wire(self) -> Wire:
+        return self._wire
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick
+
+    def set_traffic(self, traffic: list[TrafficSource]) -> None:
+        self._schedules = create_schedules(self._devices, traffic)
+
+    def tick(self) -> None:
+        if self._observer is not None:
+            self._observer.on_tick(self._tick)
+        for index, device in enumerate(self._devices):
+            schedule = self._schedules[index]
+            if schedule.next_tick == self._tick:
+                device.queue_packets(schedule.pop(self._tick))
+            device.tick()
+        self._wire.tick()
+        self._tick += 1
+
+    def run(self, ticks: int) -> None:
+        for _ in range(ticks):
+            self.tick()
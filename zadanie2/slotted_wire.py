@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+
+from wire import Wire
+
+
+class SlottedWire(Wire):
+    @dataclass(slots=True)
+    class Signal:
+        symbol: str
+        ticks_left: int
+        direction: Wire.SignalDirection
+        ticks_to_propagate: int = 1
+
+    def __init__(self, length: int) -> None:
+        super().__init__(length)
+        self._free_signals: list[SlottedWire.Signal] = []
+        self._new_signals: list[SlottedWire.Signal] = []
+        self._new_positions: list[int] = []
+        self._touched_positions: list[int] = []
+
+    def _acquire_signal(self, symbol: str, ticks_left: int, direction: Wire.SignalDirection) -> "SlottedWire.Signal":
+        if not self._free_signals:
+            return self.Signal(symbol, ticks_left, direction)
+        signal = self._free_signals.pop()
+        signal.symbol = symbol
+        signal.ticks_left = ticks_left
+        signal.direction = direction
+        signal.ticks_to_propagate = 1
+        return signal
+
+    def tick(self) -> None:
+        self._spread_signals()
+
+        touched_positions = self._touched_positions
+        touched_positions.extend(self._active_positions)
+        for position in touched_positions:
+            signals = self._signal_groups[position]
+            kept = 0
+            for signal in signals:
+                signal.ticks_left -= 1
+                if signal.ticks_to_propagate >= 0:
+                    signal.ticks_to_propagate -= 1
+                if signal.ticks_left >= 0:
+                    signals[kept] = signal
+                    kept += 1
+                else:
+                    self._free_signals.append(signal)
+            del signals[kept:]
+            if not kept:
+                self._active_positions.remove(position)
+
+        self._update_segment_symbols(touched_positions)
+        touched_positions.clear()
+
+        if self.observer is not None:
+            self.observer.on_wire_tick(bool(self._active_positions))
+
+    def _spread_signals(self) -> None:
+        for position in self._active_positions:
+            for signal in self._signal_groups[position]:
+                if signal.ticks_to_propagate == 0:
+                    if signal.direction != self.SignalDirection.RIGHT and position > 0:
+                        self._new_signals.append(self._acquire_signal(signal.symbol, signal.ticks_left + 1, self.SignalDirection.LEFT))
+                        self._new_positions.append(position - 1)
+                    if signal.direction != self.SignalDirection.LEFT and position < self._length - 1:
+                        self._new_signals.append(self._acquire_signal(signal.symbol, signal.ticks_left + 1, self.SignalDirection.RIGHT))
+                        self._new_positions.append(position + 1)
+
+        for new_signal, position in zip(self._new_signals, self._new_positions):
+            self._signal_groups[position].append(new_signal)
+            self._active_positions.add(position)
+        self._new_signals.clear()
+        self._new_positions.clear()
+
+    def send_signal(self, device_position: int, signal_symbol: str, tick_lifetime: int) -> None:
+        self._signal_groups[device_position].append(self._acquire_signal(signal_symbol, tick_lifetime, self.SignalDirection.BOTH))
+        self._active_positions.add(device_position)
+
+    def send_jam_signal(self, device_position: int, tick_lifetime: int) -> None:
+        self.send_signal(device_position, self.JAM_SIGNAL_SYMBOL, tick_lifetime)
@@ -0,0 +1,212 @@
+import argparse
+import csv
+import itertools
+import json
+import math
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+from device import Device, TooManyAttemptsError
+from event_simulation import EventSimulation, EventWire
+from main import ENGINES, TICKS, WIRE_BACKENDS, create_wire
+from simulation import Simulation, device_positions, device_streams, device_symbol
+
+T_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228, 2.201, 2.179, 2.160, 2.145, 2.131,
+        2.120, 2.110, 2.101, 2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+Z_95 = 1.960
+
+METRICS = ("successfull_transmissions", "failed_transmissions", "throughput", "collision_rate")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    devices: int
+    wire_length: int
+    probability: float
+    ticks: int
+
+
+@dataclass
+class Replication:
+    scenario: Scenario
+    seed: str
+    successfull_transmissions: int
+    failed_transmissions: int
+    throughput: float
+    collision_rate: float
+    aborted: bool
+
+
+def run_replication(scenario: Scenario, seed: str, engine: str = "event", wire_backend: str = "list") -> Replication:
+    positions = device_positions(scenario.devices, scenario.wire_length)
+    rngs = device_streams(seed, scenario.devices)
+    if engine == "event":
+        wire = EventWire(scenario.wire_length, positions)
+        devices = [Device(device_symbol(index), wire, position, rngs[index]) for index, position in enumerate(positions)]
+        simulation = EventSimulation(wire, devices, scenario.probability)
+    else:
+        wire = create_wire(wire_backend, scenario.wire_length)
+        devices = [Device(device_symbol(index), wire, position, rngs[index]) for index, position in enumerate(positions)]
+        simulation = Simulation(wire, devices, scenario.probability)
+
+    aborted = False
+    try:
+        simulation.run(scenario.ticks)
+    except TooManyAttemptsError:
+        aborted = True
+
+    successes = sum(device.successfull_transmissions for device in devices)
+    failures = sum(device.failed_transmissions for device in devices)
+    attempts = successes + failures
+    return Replication(
+        scenario=scenario,
+        seed=seed,
+        successfull_transmissions=successes,
+        failed_transmissions=failures,
+        throughput=successes * 2 * scenario.wire_length / scenario.ticks,
+        collision_rate=failures / attempts if attempts else 0.0,
+        aborted=aborted,
+    )
+
+
+def _run_replication(arguments: tuple[Scenario, str, str, str]) -> Replication:
+    return run_replication(*arguments)
+
+
+def run_batch(scenario: Scenario, replications: int, base_seed: int) -> list[Replication]:
+    import numpy as np
+
+    from batched_simulation import BatchedSimulation
+
+    rng = np.random.default_rng([base_seed, scenario.devices, scenario.wire_length, round(scenario.probability * 1e12), scenario.ticks])
+    simulation = BatchedSimulation(replications, scenario.wire_length, device_positions(scenario.devices, scenario.wire_length),
+                                   scenario.probability, rng)
+    simulation.run(scenario.ticks)
+
+    results = []
+    for run in range(replications):
+        successes = int(simulation.successfull_transmissions[run].sum())
+        failures = int(simulation.failed_transmissions[run].sum())
+        attempts = successes + failures
+        results.append(Replication(
+            scenario=scenario,
+            seed=f"{base_seed}:batch:{run}",
+            successfull_transmissions=successes,
+            failed_transmissions=failures,
+            throughput=successes * 2 * scenario.wire_length / scenario.ticks,
+            collision_rate=failures / attempts if attempts else 0.0,
+            aborted=bool(simulation.aborted[run]),
+        ))
+    return results
+
+
+def _run_batch(arguments: tuple[Scenario, int, int]) -> list[Replication]:
+    return run_batch(*arguments)
+
+
+def confidence_interval(values: list[float]) -> tuple[float, float]:
+    if not values:
+        return math.nan, math.nan
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, 0.0
+    t = T_95[len(values) - 2] if len(values) - 1 <= len(T_95) else Z_95
+    return mean, t * statistics.stdev(values) / math.sqrt(len(values))
+
+
+def aggregate(scenario: Scenario, replications: list[Replication]) -> dict:
+    result = asdict(scenario)
+    result["replications"] = len(replications)
+    completed = [replication for replication in replications if not replication.aborted]
+    result["aborted"] = len(replications) - len(completed)
+    for metric in METRICS:
+        mean, half_width = confidence_interval([getattr(replication, metric) for replication in completed])
+        result[f"{metric}_mean"] = mean
+        result[f"{metric}_ci95"] = half_width
+    return result
+
+
+def sweep(scenarios: list[Scenario], replications: int, base_seed: int = 0, engine: str = "event",
+          wire_backend: str = "list", jobs: int | None = None) -> list[dict]:
+    if engine == "batched":
+        batch_tasks = [(scenario, replications, base_seed) for scenario in scenarios]
+        if jobs == 1:
+            batches = list(map(_run_batch, batch_tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                batches = list(executor.map(_run_batch, batch_tasks))
+        return [aggregate(scenario, batch) for scenario, batch in zip(scenarios, batches)]
+
+    tasks = [(scenario, f"{base_seed}:{scenario.devices}:{scenario.wire_length}:{scenario.probability}:{replication}",
+              engine, wire_backend)
+             for scenario in scenarios for replication in range(replications)]
+
+    if jobs == 1:
+        results = list(map(_run_replication, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_run_replication, tasks, chunksize=max(1, len(tasks) // 64)))
+
+    grouped: dict[Scenario, list[Replication]] = {scenario: [] for scenario in scenarios}
+    for replication in results:
+        grouped[replication.scenario].append(replication)
+    return [aggregate(scenario, grouped[scenario]) for scenario in scenarios]
+
+
+def write_csv(path: str, results: list[dict]) -> None:
+    with open(path, "w", newline="") as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def write_json(path: str, results: list[dict], meta: dict) -> None:
+    with open(path, "w") as output_file:
+        json.dump({"meta": meta, "results": results}, output_file, indent=2)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CSMA/CD parameter sweep with seeded replications.")
+    parser.add_argument("--devices", type=int, nargs="+", default=[3])
+    parser.add_argument("--wire-lengths", type=int, nargs="+", default=[40])
+    parser.add_argument("--probabilities", type=float, nargs="+", default=[0.001, 0.005, 0.01, 0.02])
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--replications", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=ENGINES + ("batched",), default="event",
+                        help="batched runs all replications of a scenario at once with NumPy")
+    parser.add_argument("--wire", choices=WIRE_BACKENDS, default="list", help="wire backend of the tick engine")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--csv")
+    parser.add_argument("--json")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    scenarios = [Scenario(devices, wire_length, probability, args.ticks)
+                 for devices, wire_length, probability in itertools.product(args.devices, args.wire_lengths, args.probabilities)]
+    results = sweep(scenarios, args.replications, args.seed, args.engine, args.wire, args.jobs)
+
+    print(f"{'devices':>7} {'length':>6} {'load':>8} {'successes':>18} {'failures':>18} {'throughput':>16} {'collisions':>16} "
+          f"{'aborted':>7}")
+    for result in results:
+        print(
+            f"{result['devices']:>7} {result['wire_length']:>6} {result['probability']:>8} "
+            f"{result['successfull_transmissions_mean']:>9.1f} ±{result['successfull_transmissions_ci95']:>7.1f} "
+            f"{result['failed_transmissions_mean']:>9.1f} ±{result['failed_transmissions_ci95']:>7.1f} "
+            f"{result['throughput_mean']:>7.3f} ±{result['throughput_ci95']:>7.3f} "
+            f"{result['collision_rate_mean']:>7.3f} ±{result['collision_rate_ci95']:>7.3f} "
+            f"{result['aborted']:>7}"
+        )
+
+    if args.csv:
+        write_csv(args.csv, results)
+    if args.json:
+        meta = {"replications": args.replications, "seed": args.seed, "engine": args.engine, "ticks": args.ticks}
+        write_json(args.json, results, meta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from device import Device
+from event_simulation import EventSimulation, EventWire
+from simulation import Simulation, device_positions, device_streams, device_symbol
+from topology import load_topology
+from wire import Wire
+
+TOPOLOGY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "topology_example.json")
+
+
+def transmissions(devices: list[Device]) -> list[tuple[str, int, int]]:
+    return [(device.symbol, device.successfull_transmissions, device.failed_transmissions) for device in devices]
+
+
+def run_plain(engine: str, wire_length: int, count: int, probability: float, ticks: int, seed: int):
+    positions = device_positions(count, wire_length)
+    wire = EventWire(wire_length, positions) if engine == "event" else Wire(wire_length)
+    devices = [Device(device_symbol(index), wire, position, rng)
+               for index, (position, rng) in enumerate(zip(positions, device_streams(seed, count)))]
+    simulation = (EventSimulation if engine == "event" else Simulation)(wire, devices, probability)
+    simulation.run(ticks)
+    return simulation.tick_count, transmissions(devices)
+
+
+def run_topology(engine: str, probability: float, ticks: int, seed: int):
+    topology = load_topology(TOPOLOGY_PATH)
+    wire = topology.create_event_wire() if engine == "event" else topology.create_wire()
+    devices = topology.create_devices(wire, device_streams(seed, len(topology.devices)))
+    simulation = (EventSimulation if engine == "event" else Simulation)(wire, devices, probability)
+    simulation.run(ticks)
+    return simulation.tick_count, transmissions(devices)
+
+
+@pytest.mark.parametrize("wire_length, count, probability, ticks, seed", [
+    (40, 3, 0.002, 20000, 1),
+    (100, 5, 0.001, 10000, 7),
+    (400, 2, 0.001, 8000, 42),
+])
+def test_plain_wire_engines_match(wire_length: int, count: int, probability: float, ticks: int, seed: int) -> None:
+    tick_result = run_plain("tick", wire_length, count, probability, ticks, seed)
+    event_result = run_plain("event", wire_length, count, probability, ticks, seed)
+    assert tick_result == event_result
+    assert tick_result[0] == ticks
+    assert sum(successes for _, successes, _ in tick_result[1]) > 0
+    assert sum(failures for _, _, failures in tick_result[1]) > 0
+
+
+@pytest.mark.parametrize("seed", [3, 11])
+def test_topology_wire_engines_match(seed: int) -> None:
+    tick_result = run_topology("tick", 0.0005, 5000, seed)
+    event_result = run_topology("event", 0.0005, 5000, seed)
+    assert tick_result == event_result
+    assert tick_result[0] == 5000
+    assert sum(successes for _, successes, _ in tick_result[1]) > 0
+    assert sum(failures for _, _, failures in tick_result[1]) > 0
@@ -0,0 +1,28 @@
+import asyncio
+
+from script import LineViewer
+
+
+def write_trace(path, lines):
+    path.write_text("".join(f"{line}\n" for line in lines))
+    return str(path)
+
+
+async def press_keys(filename, keys):
+    app = LineViewer(filename)
+    async with app.run_test() as pilot:
+        lines = []
+        for key in keys:
+            await pilot.press(key)
+            lines.append(app.current_line)
+        return lines
+
+
+def test_navigation_keys_work_at_startup(tmp_path):
+    filename = write_trace(tmp_path / "trace.txt", ["---", "-A-", "#A#", "---"])
+    assert asyncio.run(press_keys(filename, ["space", "space", "b"])) == [1, 2, 1]
+
+
+def test_escape_returns_keys_to_viewer(tmp_path):
+    filename = write_trace(tmp_path / "trace.txt", ["---", "-A-", "#A#", "---"])
+    assert asyncio.run(press_keys(filename, ["g", "space", "escape", "n"])) == [0, 0, 0, 2]
@@ -0,0 +1,221 @@
+import argparse
+import cProfile
+import gc
+import itertools
+import json
+import os
+import platform
+import tempfile
+import time
+from collections import defaultdict
+from typing import Callable, TextIO
+
+from device import Device, TooManyAttemptsError
+from event_simulation import EventSimulation, EventWire
+from main import ENGINES, WIRE_BACKENDS, create_wire
+from simulation import Simulation, device_positions, device_streams, device_symbol
+
+WIRE_LENGTHS = (40, 400, 2000)
+DEVICE_COUNTS = (3, 20)
+PROBABILITIES = (0.001, 0.01)
+TICKS = 1000
+
+
+def build_simulation(engine: str, backend: str, wire_length: int, devices: int, probability: float, seed: int):
+    positions = device_positions(devices, wire_length)
+    rngs = device_streams(seed, devices)
+    wire = EventWire(wire_length, positions) if engine == "event" else create_wire(backend, wire_length)
+    stations = [Device(device_symbol(index), wire, position, rngs[index]) for index, position in enumerate(positions)]
+    if engine == "event":
+        return EventSimulation(wire, stations, probability), wire, stations
+    return Simulation(wire, stations, probability), wire, stations
+
+
+def run_loop(engine: str, simulation, wire, ticks: int, output_file: TextIO | None) -> bool:
+    try:
+        if engine == "event" or output_file is None:
+            simulation.run(ticks)
+        else:
+            for _ in range(ticks):
+                simulation.tick()
+                output_file.write(f"{wire}\n")
+    except TooManyAttemptsError:
+        return False
+    return True
+
+
+def warmed_up(engine: str, backend: str, wire_length: int, devices: int, probability: float, seed: int, warmup_ticks: int,
+              output_file: TextIO | None):
+    simulation, wire, stations = build_simulation(engine, backend, wire_length, devices, probability, seed)
+    if not run_loop(engine, simulation, wire, warmup_ticks, output_file):
+        return None
+    return simulation, wire, stations
+
+
+def timed(timings: dict[str, float], phase: str, function: Callable) -> Callable:
+    def measure(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings[phase] += time.perf_counter() - start
+
+    return measure
+
+
+def instrument(timings: dict[str, float], wire, devices: list[Device]) -> None:
+    for device in devices:
+        device.tick = timed(timings, "device_tick", device.tick)
+    wire.tick = timed(timings, "wire_tick", wire.tick)
+    wire._spread_signals = timed(timings, "spread_signals", wire._spread_signals)
+    wire._update_segment_symbols = timed(timings, "update_segment_symbols", wire._update_segment_symbols)
+
+
+def run_phases(simulation, wire, devices: list[Device], ticks: int, output_file: TextIO | None) -> dict[str, dict[str, float]]:
+    timings: dict[str, float] = defaultdict(float)
+    instrument(timings, wire, devices)
+    finished_ticks = dict(timings)
+    try:
+        for _ in range(ticks):
+            start = time.perf_counter()
+            simulation.tick()
+            ticked = time.perf_counter()
+            timings["simulation_tick"] += ticked - start
+            if output_file is not None:
+                row = f"{wire}\n"
+                rendered = time.perf_counter()
+                output_file.write(row)
+                timings["render"] += rendered - ticked
+                timings["write"] += time.perf_counter() - rendered
+            finished_ticks = dict(timings)
+    except TooManyAttemptsError:
+        timings.clear()
+        timings.update(finished_ticks)
+
+    phases = {
+        "device_tick": timings["device_tick"],
+        "spread_signals": timings["spread_signals"],
+        "wire_rebuild": timings["wire_tick"] - timings["spread_signals"] - timings["update_segment_symbols"],
+        "update_segment_symbols": timings["update_segment_symbols"],
+        "arrivals_and_loop": timings["simulation_tick"] - timings["device_tick"] - timings["wire_tick"],
+        "render": timings["render"],
+        "write": timings["write"],
+    }
+    total = sum(phases.values())
+    return {phase: {"seconds": seconds, "share": seconds / total if total else 0.0} for phase, seconds in phases.items()}
+
+
+def case_name(case: dict) -> str:
+    engine = f"{case['engine']}-{case['backend']}" if case["backend"] else case["engine"]
+    return f"{engine}-L{case['wire_length']}-D{case['devices']}-p{case['probability']}"
+
+
+def measure(engine: str, backend: str, wire_length: int, devices: int, probability: float, ticks: int, warmup_ticks: int,
+            seed: int, write_output: bool, profile_dir: str | None) -> dict:
+    case = {"engine": engine, "backend": backend if engine == "tick" else None, "wire_length": wire_length, "devices": devices,
+            "probability": probability, "ticks": ticks}
+
+    with tempfile.TemporaryFile("w") as output_file:
+        output = output_file if write_output else None
+
+        case.update(seconds=None, ticks_run=None, ticks_per_second=None, completed=False, phases=None)
+        built = warmed_up(engine, backend, wire_length, devices, probability, seed, warmup_ticks, output)
+        if built is None:
+            return case
+        simulation, wire, _ = built
+        gc.collect()
+        start_tick = simulation.tick_count
+        start = time.perf_counter()
+        completed = run_loop(engine, simulation, wire, ticks, output)
+        seconds = time.perf_counter() - start
+        ticks_run = simulation.tick_count - start_tick if completed or engine == "tick" else None
+        case.update(seconds=seconds, ticks_run=ticks_run, ticks_per_second=ticks_run / seconds if ticks_run and seconds > 0 else None,
+                    completed=completed)
+
+        built = warmed_up(engine, backend, wire_length, devices, probability, seed, warmup_ticks, output) if engine == "tick" else None
+        if built is not None:
+            simulation, wire, stations = built
+            case["phases"] = run_phases(simulation, wire, stations, ticks, output)
+
+        built = warmed_up(engine, backend, wire_length, devices, probability, seed, warmup_ticks, output) if profile_dir else None
+        if built is not None:
+            simulation, wire, _ = built
+            profiler = cProfile.Profile()
+            profiler.enable()
+            run_loop(engine, simulation, wire, ticks, output)
+            profiler.disable()
+            case["profile"] = os.path.join(profile_dir, f"{case_name(case)}.pstats")
+            profiler.dump_stats(case["profile"])
+    return case
+
+
+def load_baseline(path: str) -> dict[tuple, dict]:
+    with open(path) as baseline_file:
+        results = json.load(baseline_file)["results"]
+    return {(result["engine"], result["backend"], result["wire_length"], result["devices"], result["probability"]): result
+            for result in results}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Speed and per-phase time of the simulation tick loop.")
+    parser.add_argument("--engines", choices=ENGINES, nargs="+", default=["tick"])
+    parser.add_argument("--backends", choices=WIRE_BACKENDS, nargs="+", default=["list"], help="wire backends of the tick engine")
+    parser.add_argument("--wire-lengths", type=int, nargs="+", default=list(WIRE_LENGTHS))
+    parser.add_argument("--devices", type=int, nargs="+", default=list(DEVICE_COUNTS))
+    parser.add_argument("--probabilities", type=float, nargs="+", default=list(PROBABILITIES))
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--warmup-ticks", type=int, help="ticks run before measuring (default: one signal lifetime, 2 * wire length)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-output", action="store_true", help="do not write the wire state every tick like main.py does")
+    parser.add_argument("--profile", metavar="DIR", help="also run every case under cProfile and dump .pstats files here")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare ticks/s against")
+    parser.add_argument("--output", help="JSON file with the results")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+
+    cases = [(engine, backend) for engine in args.engines for backend in (args.backends if engine == "tick" else [None])]
+    results = []
+    print(f"{'engine':<6} {'backend':<8} {'length':>6} {'devices':>7} {'load':>7} {'ticks/s':>10} {'speedup':>8}  slowest phases")
+    for (engine, backend), wire_length, devices, probability in itertools.product(cases, args.wire_lengths, args.devices,
+                                                                                   args.probabilities):
+        warmup_ticks = args.warmup_ticks if args.warmup_ticks is not None else 2 * wire_length
+        result = measure(engine, backend, wire_length, devices, probability, args.ticks, warmup_ticks, args.seed,
+                         not args.no_output, args.profile)
+        results.append(result)
+
+        previous = baseline.get((engine, result["backend"], wire_length, devices, probability))
+        rate = result["ticks_per_second"]
+        speedup = f"{rate / previous['ticks_per_second']:.2f}x" if rate and previous and previous["ticks_per_second"] else "-"
+        notes = []
+        if result["seconds"] is None:
+            notes.append("aborted during warmup")
+        elif not result["completed"]:
+            notes.append(f"aborted after {result['ticks_run']} ticks" if result["ticks_run"] is not None else "aborted")
+        if result["phases"]:
+            slowest = sorted(result["phases"].items(), key=lambda item: item[1]["share"], reverse=True)[:3]
+            notes.append(", ".join(f"{phase} {timing['share']:.0%}" for phase, timing in slowest))
+        speed = f"{rate:.1f}" if rate else "aborted"
+        print(f"{engine:<6} {str(result['backend'] or '-'):<8} {wire_length:>6} {devices:>7} {probability:>7} "
+              f"{speed:>10} {speedup:>8}  {'; '.join(notes)}")
+
+    if args.output:
+        meta = {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "arguments": vars(args),
+        }
+        with open(args.output, "w") as output_file:
+            json.dump({"meta": meta, "results": results}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import json
+import os
+import random
+from collections import deque
+from dataclasses import dataclass
+
+from device import Device
+from event_simulation import EventWire
+from simulation import device_positions, device_symbol
+from wire import Wire
+
+JOINT_TYPES = ("hub", "repeater")
+
+
+class TopologyWire(Wire):
+    @dataclass
+    class Signal:
+        symbol: str
+        ticks_left: int
+        source: int
+        ticks_to_propagate: int = 1
+
+        def tick(self) -> None:
+            self.ticks_left -= 1
+            self.ticks_to_propagate -= 1
+
+        @property
+        def is_active(self) -> bool:
+            return self.ticks_left >= 0
+
+        @property
+        def is_ready_to_propagate(self) -> bool:
+            return self.ticks_to_propagate == 0
+
+    def __init__(self, neighbours: list[list[int]], sections: list[tuple[str, int, int]]) -> None:
+        super().__init__(len(neighbours))
+        self._neighbours = neighbours
+        self._sections = sections
+        self._distances: dict[int, list[int]] = {}
+
+    def _spread_signals(self) -> None:
+        new_signals = []
+
+        for position in self._active_positions:
+            for signal in self._signal_groups[position]:
+                if signal.is_ready_to_propagate:
+                    for neighbour in self._neighbours[position]:
+                        if neighbour != signal.source:
+                            new_signals.append((self.Signal(signal.symbol, signal.ticks_left + 1, position), neighbour))
+
+        for new_signal, position in new_signals:
+            self._signal_groups[position].append(new_signal)
+            self._active_positions.add(position)
+
+    def send_signal(self, device_position: int, signal_symbol: str, tick_lifetime: int) -> None:
+        self._signal_groups[device_position].append(self.Signal(signal_symbol, tick_lifetime, -1))
+        self._active_positions.add(device_position)
+
+    def send_jam_signal(self, device_position: int, tick_lifetime: int) -> None:
+        self.send_signal(device_position, self.JAM_SIGNAL_SYMBOL, tick_lifetime)
+
+    def distance(self, source: int, target: int) -> int:
+        if source not in self._distances:
+            distances = [-1] * self.length
+            distances[source] = 0
+            queue = deque([source])
+            while queue:
+                position = queue.popleft()
+                for neighbour in self._neighbours[position]:
+                    if distances[neighbour] == -1:
+                        distances[neighbour] = distances[position] + 1
+                        queue.append(neighbour)
+            self._distances[source] = distances
+        return self._distances[source][target]
+
+    def __str__(self) -> str:
+        return "|".join("".join(self._symbols[start:start + length]) for _, start, length in self._sections)
+
+
+class Topology:
+    def __init__(self, description: dict) -> None:
+        self._neighbours: list[list[int]] = []
+        self._sections: list[tuple[str, int, int]] = []
+        self._segment_starts: dict[str, tuple[int, int]] = {}
+        self._parents: list[int] = []
+
+        for segment in description.get("segments", []):
+            name, length = segment["name"], segment["length"]
+            if name in self._segment_starts:
+                raise ValueError(f"Segment '{name}' is defined more than once.")
+            if length < 1:
+                raise ValueError(f"Segment '{name}' has to be at least 1 long.")
+            start = self._add_nodes(name, length)
+            self._segment_starts[name] = (start, length)
+            for position in range(start, start + length - 1):
+                self._connect(position, position + 1)
+
+        for joint in description.get("joints", []):
+            joint_type = joint.get("type", "hub")
+            if joint_type not in JOINT_TYPES:
+                raise ValueError(f"Unknown joint type '{joint_type}', expected one of {', '.join(JOINT_TYPES)}.")
+            if joint_type == "repeater" and len(joint["ports"]) != 2:
+                raise ValueError(f"Repeater '{joint['name']}' has to connect exactly 2 ports.")
+            node = self._add_nodes(joint["name"], 1)
+            for segment, offset in joint["ports"]:
+                self._connect(node, self.position(segment, offset))
+
+        self.devices: list[tuple[str, int]] = []
+        for device in description.get("devices", []):
+            if "count" in device:
+                start, length = self._segment(device["segment"])
+                for offset in device_positions(device["count"], length):
+                    self.devices.append((device_symbol(len(self.devices)), start + offset))
+            else:
+                symbol = device.get("symbol", device_symbol(len(self.devices)))
+                self.devices.append((symbol, self.position(device["segment"], device["position"])))
+
+        symbols = [symbol for symbol, _ in self.devices]
+        if len(set(symbols)) != len(symbols):
+            raise ValueError("Device symbols have to be unique.")
+
+    def _add_nodes(self, name: str, count: int) -> int:
+        start = len(self._neighbours)
+        self._neighbours.extend([] for _ in range(count))
+        self._parents.extend(range(start, start + count))
+        self._sections.append((name, start, count))
+        return start
+
+    def _find(self, node: int) -> int:
+        while self._parents[node] != node:
+            self._parents[node] = self._parents[self._parents[node]]
+            node = self._parents[node]
+        return node
+
+    def _connect(self, first: int, second: int) -> None:
+        first_root, second_root = self._find(first), self._find(second)
+        if first_root == second_root:
+            raise ValueError("Topology must not contain loops.")
+        self._parents[first_root] = second_root
+        self._neighbours[first].append(second)
+        self._neighbours[second].append(first)
+
+    def _segment(self, name: str) -> tuple[int, int]:
+        if name not in self._segment_starts:
+            raise ValueError(f"Unknown segment '{name}'.")
+        return self._segment_starts[name]
+
+    def position(self, segment: str, offset: int) -> int:
+        start, length = self._segment(segment)
+        if not 0 <= offset < length:
+            raise ValueError(f"Position in segment '{segment}' has to be a number in range [0, {length - 1}].")
+        return start + offset
+
+    @property
+    def length(self) -> int:
+        return len(self._neighbours)
+
+    def create_wire(self) -> TopologyWire:
+        return TopologyWire(self._neighbours, self._sections)
+
+    def create_event_wire(self) -> EventWire:
+        return EventWire(self.length, [position for _, position in self.devices], self.create_wire().distance)
+
+    def create_devices(self, wire: Wire, rngs: list[random.Random] | None = None) -> list[Device]:
+        rngs = rngs or [None] * len(self.devices)
+        return [Device(symbol, wire, position, rng) for (symbol, position), rng in zip(self.devices, rngs)]
+
+
+def load_topology(path: str) -> Topology:
+    with open(path) as topology_file:
+        if os.path.splitext(path)[1] in (".yaml", ".yml"):
+            import yaml
+
+            description = yaml.safe_load(topology_file)
+        else:
+            description = json.load(topology_file)
+    return Topology(description)
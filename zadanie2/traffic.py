@@ -0,0 +1,162 @@
+import math
+import random
+from abc import ABC, abstractmethod
+from array import array
+
+ARRIVAL_CHUNK = 256
+
+TRAFFIC_MODELS = ("bernoulli", "poisson", "onoff", "saturated", "trace")
+
+
+def next_arrival(tick: int, probability: float, rng: random.Random) -> float:
+    if probability >= 1:
+        return tick + 1
+    if probability <= 0:
+        return math.inf
+    return tick + int(math.log(1.0 - rng.random()) / math.log(1.0 - probability)) + 1
+
+
+class TrafficSource(ABC):
+    saturated = False
+
+    @abstractmethod
+    def arrivals(self, count: int, rng: random.Random) -> array:
+        pass
+
+
+class BernoulliTraffic(TrafficSource):
+    def __init__(self, probability: float, start_tick: int = 0) -> None:
+        self._probability = probability
+        self._tick = start_tick - 1
+
+    def arrivals(self, count: int, rng: random.Random) -> array:
+        result = array("q")
+        if self._probability <= 0:
+            return result
+        for _ in range(count):
+            self._tick = next_arrival(self._tick, self._probability, rng)
+            result.append(self._tick)
+        return result
+
+
+class PoissonTraffic(TrafficSource):
+    def __init__(self, rate: float, start_tick: int = 0) -> None:
+        self._rate = rate
+        self._time = float(start_tick)
+
+    def arrivals(self, count: int, rng: random.Random) -> array:
+        result = array("q")
+        if self._rate <= 0:
+            return result
+        for _ in range(count):
+            self._time += rng.expovariate(self._rate)
+            result.append(int(self._time))
+        return result
+
+
+class OnOffTraffic(TrafficSource):
+    def __init__(self, probability: float, mean_on: float, mean_off: float, start_tick: int = 0) -> None:
+        if mean_on < 1 or mean_off < 1:
+            raise Exception("Mean on and off periods have to be at least 1 tick long.")
+        self._probability = probability
+        self._mean_on = mean_on
+        self._mean_off = mean_off
+        self._is_on = False
+        self._tick = start_tick
+        self._period_end = start_tick
+
+    def _period_length(self, mean: float, rng: random.Random) -> int:
+        return next_arrival(-1, 1 / mean, rng) + 1
+
+    def arrivals(self, count: int, rng: random.Random) -> array:
+        result = array("q")
+        if self._probability <= 0:
+            return result
+        while len(result) < count:
+            if self._tick >= self._period_end:
+                self._is_on = not self._is_on
+                self._period_end = self._tick + self._period_length(self._mean_on if self._is_on else self._mean_off, rng)
+            if not self._is_on:
+                self._tick = self._period_end
+                continue
+            arrival = next_arrival(self._tick - 1, self._probability, rng)
+            if arrival >= self._period_end:
+                self._tick = self._period_end
+                continue
+            result.append(arrival)
+            self._tick = arrival + 1
+        return result
+
+
+class SaturatedTraffic(TrafficSource):
+    saturated = True
+
+    def arrivals(self, count: int, rng: random.Random) -> array:
+        return array("q")
+
+
+class TraceTraffic(TrafficSource):
+    def __init__(self, ticks: list[int], start_tick: int = 0) -> None:
+        self._ticks = array("q", sorted(tick for tick in ticks if tick >= start_tick))
+        self._index = 0
+
+    def arrivals(self, count: int, rng: random.Random) -> array:
+        result = self._ticks[self._index:self._index + count]
+        self._index += len(result)
+        return result
+
+
+class ArrivalSchedule:
+    def __init__(self, source: TrafficSource, rng: random.Random, chunk_size: int = ARRIVAL_CHUNK) -> None:
+        self._source = source
+        self._rng = rng
+        self._chunk_size = chunk_size
+        self._arrivals = array("q")
+        self._index = 0
+        self._refill()
+
+    @property
+    def saturated(self) -> bool:
+        return self._source.saturated
+
+    @property
+    def next_tick(self) -> float:
+        return self._arrivals[self._index] if self._index < len(self._arrivals) else math.inf
+
+    def _refill(self) -> None:
+        self._arrivals = self._source.arrivals(self._chunk_size, self._rng)
+        self._index = 0
+
+    def pop(self, tick: int) -> int:
+        count = 0
+        while self._index < len(self._arrivals) and self._arrivals[self._index] <= tick:
+            count += 1
+            self._index += 1
+            if self._index == len(self._arrivals):
+                self._refill()
+        return count
+
+
+def load_arrival_trace(path: str) -> dict[str, list[int]]:
+    ticks: dict[str, list[int]] = {}
+    with open(path) as trace_file:
+        for line in trace_file:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            symbol, tick = fields
+            ticks.setdefault(symbol, []).append(int(tick))
+    return ticks
+
+
+def create_traffic(kind: str, symbols: list[str], probability: float, mean_on: float = 100, mean_off: float = 900,
+                   trace: dict[str, list[int]] | None = None, start_tick: int = 0) -> list[TrafficSource]:
+    if kind == "poisson":
+        return [PoissonTraffic(probability, start_tick) for _ in symbols]
+    if kind == "onoff":
+        return [OnOffTraffic(probability, mean_on, mean_off, start_tick) for _ in symbols]
+    if kind == "saturated":
+        return [SaturatedTraffic() for _ in symbols]
+    if kind == "trace":
+        return [TraceTraffic((trace or {}).get(symbol, []), start_tick) for symbol in symbols]
+    return [BernoulliTraffic(probability, start_tick) for _ in symbols]
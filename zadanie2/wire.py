@@ -35,6 +35,8 @@ class Wire:
         self._length = length
         self._symbols = [self.DEFAULT_SIGNAL_SYMBOL] * length
         self._signal_groups = [[] for _ in range(length)]
+        self._active_positions: set[int] = set()
+        self.observer = None
 
     @property
     def length(self) -> int:
@@ -46,15 +48,23 @@ class Wire:
     def tick(self) -> None:
         self._spread_signals()
 
-        self._signal_groups = [[signal for signal in signals if signal.tick() or signal.is_active] for signals in self._signal_groups]
+        touched_positions = list(self._active_positions)
+        for position in touched_positions:
+            signals = [signal for signal in self._signal_groups[position] if signal.tick() or signal.is_active]
+            self._signal_groups[position] = signals
+            if not signals:
+                self._active_positions.remove(position)
 
-        self._update_segment_symbols()
+        self._update_segment_symbols(touched_positions)
+
+        if self.observer is not None:
+            self.observer.on_wire_tick(bool(self._active_positions))
 
     def _spread_signals(self) -> None:
         new_signals = []
 
-        for position, signal_group in enumerate(self._signal_groups):
-            for signal in signal_group:
+        for position in self._active_positions:
+            for signal in self._signal_groups[position]:
                 if signal.is_ready_to_propagate:
                     if (signal.direction == self.SignalDirection.LEFT or signal.direction == self.SignalDirection.BOTH) and self.is_position_valid(position - 1):
                         new_signals.append((self.Signal(signal.symbol, signal.ticks_left + 1, self.SignalDirection.LEFT), position - 1))
@@ -63,9 +73,11 @@ class Wire:
 
         for new_signal, position in new_signals:
             self._signal_groups[position].append(new_signal)
+            self._active_positions.add(position)
 
-    def _update_segment_symbols(self) -> None:
-        for index, signals in enumerate(self._signal_groups):
+    def _update_segment_symbols(self, positions: list[int]) -> None:
+        for index in positions:
+            signals = self._signal_groups[index]
             if len(signals) == 0:
                 self._symbols[index] = self.DEFAULT_SIGNAL_SYMBOL
             elif len(signals) == 1:
@@ -77,9 +89,11 @@ class Wire:
 
     def send_signal(self, device_position: int, signal_symbol: str, tick_lifetime: int) -> None:
         self._signal_groups[device_position].append(self.Signal(signal_symbol, tick_lifetime, self.SignalDirection.BOTH))
+        self._active_positions.add(device_position)
 
     def send_jam_signal(self, device_position: int, tick_lifetime: int) -> None:
         self._signal_groups[device_position].append(self.Signal(self.JAM_SIGNAL_SYMBOL, tick_lifetime, self.SignalDirection.BOTH))
+        self._active_positions.add(device_position)
 
     def is_free(self, position: int, signal_symbol: str) -> bool:
         return self._symbols[position] == self.DEFAULT_SIGNAL_SYMBOL or self._symbols[position] == signal_symbol
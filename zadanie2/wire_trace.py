@@ -0,0 +1,196 @@
+import argparse
+import re
+import struct
+import sys
+import zlib
+from array import array
+
+MAGIC = b"WTRC"
+VERSION = 1
+HEADER = struct.Struct("<4sBII")
+TRAILER = struct.Struct("<QQQ4s")
+
+BLOCK_TICKS = 256
+COMPRESSION_LEVEL = 6
+
+_ANY_RUN_PATTERN = r"(.)\1*"
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, offset: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class TraceWriter:
+    def __init__(self, path: str, wire_length: int, block_ticks: int = BLOCK_TICKS) -> None:
+        self._file = open(path, "wb")
+        self._wire_length = wire_length
+        self._block_ticks = block_ticks
+        self._file.write(HEADER.pack(MAGIC, VERSION, wire_length, block_ticks))
+        self._block = bytearray()
+        self._block_index = array("Q")
+        self._tick_count = 0
+        self._symbol_ids: dict[str, int] = {}
+        self._run_pattern = re.compile(_ANY_RUN_PATTERN, re.DOTALL)
+        self._previous_row: str | None = None
+
+    @property
+    def tick_count(self) -> int:
+        return self._tick_count
+
+    def write(self, row: str) -> None:
+        if len(row) != self._wire_length:
+            raise ValueError(f"Trace row has to be {self._wire_length} symbols long.")
+
+        if row == self._previous_row and self._block:
+            self._block.append(0)
+        else:
+            runs = list(self._run_pattern.finditer(row))
+            _write_varint(self._block, len(runs))
+            for run in runs:
+                _write_varint(self._block, run.end() - run.start())
+                _write_varint(self._block, self._symbol_id(row[run.start()]))
+            self._previous_row = row
+
+        self._tick_count += 1
+        if self._tick_count % self._block_ticks == 0:
+            self._flush_block()
+
+    def _symbol_id(self, symbol: str) -> int:
+        if symbol not in self._symbol_ids:
+            self._symbol_ids[symbol] = len(self._symbol_ids)
+            known_runs = "|".join(f"{re.escape(known)}+" for known in self._symbol_ids)
+            self._run_pattern = re.compile(f"{known_runs}|{_ANY_RUN_PATTERN}", re.DOTALL)
+        return self._symbol_ids[symbol]
+
+    def _flush_block(self) -> None:
+        self._block_index.append(self._file.tell())
+        self._file.write(zlib.compress(self._block, COMPRESSION_LEVEL))
+        self._block.clear()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        if self._block:
+            self._flush_block()
+
+        symbols_offset = self._file.tell()
+        self._block_index.append(symbols_offset)
+        symbols = bytearray()
+        encoded_symbols = "".join(self._symbol_ids).encode("utf-8")
+        _write_varint(symbols, len(encoded_symbols))
+        self._file.write(symbols + encoded_symbols)
+        index_offset = self._file.tell()
+        self._file.write(self._block_index.tobytes())
+        self._file.write(TRAILER.pack(symbols_offset, index_offset, self._tick_count, MAGIC))
+        self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TraceReader:
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+
+        magic, version, self._wire_length, self._block_ticks = HEADER.unpack(self._file.read(HEADER.size))
+        self._file.seek(-TRAILER.size, 2)
+        symbols_offset, index_offset, self._tick_count, trailer_magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != MAGIC or trailer_magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' is not a wire trace file.")
+
+        self._file.seek(symbols_offset)
+        symbols = self._file.read(index_offset - symbols_offset)
+        symbols_length, offset = _read_varint(symbols, 0)
+        self._symbols = symbols[offset:offset + symbols_length].decode("utf-8")
+
+        self._block_index = array("Q")
+        self._block_index.frombytes(self._file.read(8 * (-(-self._tick_count // self._block_ticks) + 1)))
+        self._cached_block = -1
+        self._cached_rows: list[str] = []
+
+    @property
+    def wire_length(self) -> int:
+        return self._wire_length
+
+    def __len__(self) -> int:
+        return self._tick_count
+
+    def __getitem__(self, tick: int) -> str:
+        if tick < 0:
+            tick += len(self)
+        if not 0 <= tick < len(self):
+            raise IndexError("Tick out of range.")
+
+        block, row = divmod(tick, self._block_ticks)
+        if block != self._cached_block:
+            self._cached_rows = self._read_block(block)
+            self._cached_block = block
+        return self._cached_rows[row]
+
+    def _read_block(self, block: int) -> list[str]:
+        start, end = self._block_index[block], self._block_index[block + 1]
+        self._file.seek(start)
+        data = zlib.decompress(self._file.read(end - start))
+
+        rows = []
+        offset = 0
+        while offset < len(data):
+            run_count, offset = _read_varint(data, offset)
+            if run_count == 0:
+                rows.append(rows[-1] if rows else "")
+                continue
+            runs = []
+            for _ in range(run_count):
+                run_length, offset = _read_varint(data, offset)
+                symbol_id, offset = _read_varint(data, offset)
+                runs.append(self._symbols[symbol_id] * run_length)
+            rows.append("".join(runs))
+        return rows
+
+    def __iter__(self):
+        for tick in range(len(self)):
+            yield self[tick]
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print ticks of a binary wire trace as text.")
+    parser.add_argument("trace")
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--count", type=int)
+    args = parser.parse_args()
+
+    with TraceReader(args.trace) as reader:
+        end = len(reader) if args.count is None else min(len(reader), args.start + args.count)
+        for tick in range(args.start, end):
+            sys.stdout.write(f"{reader[tick]}\n")
+
+
+if __name__ == "__main__":
+    main()